@@ -1,10 +1,13 @@
 """
 Common stuff for Artie Tool modules.
 """
+from typing import List
 from typing import Tuple
 import argparse
 import fabric
+import functools
 import invoke
+import io
 import ipaddress
 import logging
 import os
@@ -136,8 +139,9 @@ def clean_build_stuff():
     actual build artifacts.
     """
     # Check for a scratch location
-    if os.path.isdir(get_scratch_location()):
-        shutil.rmtree(get_scratch_location(), ignore_errors=True)
+    scratch = get_scratch_location()
+    if os.path.isdir(scratch):
+        shutil.rmtree(scratch, ignore_errors=True)
 
 def clean():
     """
@@ -228,9 +232,11 @@ def git_tag() -> str:
     p.check_returncode()
     return p.stdout.decode('utf-8').strip().strip("'")
 
+@functools.lru_cache(maxsize=1)
 def host_platform() -> str:
     """
     Return the platform we are on. Should be of the form 'amd64' or 'arm64'.
+    The machine isn't going to change out from under us, so we only look it up once.
     """
     p = platform.machine().lower()
     lookup = {
@@ -379,25 +385,51 @@ def set_up_logging(args):
     logger = logging.getLogger(LOGGER_NAME)
     logger.setLevel(level)
 
-def scp_from(ip: str, uname: str, password: str, target: str, dest: str|None) -> None|str:
+def scp_from(ip: str, uname: str, password: str, target: str, dest: str|None, connection: fabric.Connection|None=None) -> None|str:
     """
     Copy the file from `target` on the remote machine to the `dest` on the local machine.
     If `dest` is `None`, we return the file's contents (as bytes).
+
+    If `connection` is given (see `ssh_session()`), we use it instead of opening a new one.
     """
-    c = fabric.Connection(ip, uname, forward_agent=True, connect_timeout=30, connect_kwargs={'password': password})
+    c = connection if connection is not None else _connect(ip, uname, password)
     if dest is None:
         return c.run(f"cat {target}", hide=True).stdout
     else:
         c.get(target, local=dest)
 
-def scp_to(ip: str, uname: str, password: str, target: str, dest: str):
+def scp_from_many(ip: str, uname: str, password: str, targets: List[str], connection: fabric.Connection|None=None) -> List[str]:
+    """
+    Like `scp_from()` with `dest=None`, but fetches the contents of each of the given `targets` on the remote machine
+    in a single round trip. Returns their contents in the same order.
+
+    If `connection` is given (see `ssh_session()`), we use it instead of opening a new one.
+    """
+    c = connection if connection is not None else _connect(ip, uname, password)
+    # A NUL byte can't show up in any of the (text) files we fetch this way, so we use one to mark where each ends
+    cmd = " && ".join(f"cat {target} && printf '\\0'" for target in targets)
+    return c.run(cmd, hide=True).stdout.split('\0')[:len(targets)]
+
+def scp_to(ip: str, uname: str, password: str, target: str, dest: str, connection: fabric.Connection|None=None):
     """
     Copy the file from `target` on the local machine to the `dest` on the remote machine.
+
+    If `connection` is given (see `ssh_session()`), we use it instead of opening a new one.
     """
-    c = fabric.Connection(ip, uname, forward_agent=True, connect_timeout=30, connect_kwargs={'password': password})
+    c = connection if connection is not None else _connect(ip, uname, password)
     c.put(target, remote=dest)
 
-def ssh(cmd: str, ip: str, uname: str, password: str, timeout_s=30, fail_okay=False, additional_responders=None):
+def scp_contents_to(ip: str, uname: str, password: str, contents: str, dest: str, connection: fabric.Connection|None=None):
+    """
+    Like `scp_to()`, but writes the given `contents` to `dest` on the remote machine directly from memory,
+    rather than from a file on the local machine.
+
+    If `connection` is given (see `ssh_session()`), we use it instead of opening a new one.
+    """
+    c = connection if connection is not None else _connect(ip, uname, password)
+    c.put(io.BytesIO(contents.encode()), remote=dest)
+
+def ssh(cmd: str, ip: str, uname: str, password: str, timeout_s=30, fail_okay=False, additional_responders=None, connection: fabric.Connection|None=None):
     """
     Execute the given command at the given remote host. Will handle 'sudo' password use
     if the command invokes sudo.
@@ -407,8 +439,10 @@ def ssh(cmd: str, ip: str, uname: str, password: str, timeout_s=30, fail_okay=Fa
 
     If `additional_responders` is given, it should be a list of tuples of the form (pattern: str, response: str)
     that will be used to respond to prompts from the remote host.
+
+    If `connection` is given (see `ssh_session()`), we use it instead of opening a new one.
     """
-    c = fabric.Connection(ip, uname, forward_agent=True, connect_timeout=30, connect_kwargs={'password': password})
+    c = connection if connection is not None else _connect(ip, uname, password)
 
     sudopass = invoke.watchers.Responder(pattern=r'\[sudo\] password:', response=password)
     watchers = [sudopass]
@@ -418,6 +452,22 @@ def ssh(cmd: str, ip: str, uname: str, password: str, timeout_s=30, fail_okay=Fa
 
     c.run(cmd, pty=True, watchers=watchers, timeout=timeout_s, hide=True, warn=fail_okay)
 
+def ssh_session(ip: str, uname: str, password: str) -> fabric.Connection:
+    """
+    Open an SSH session with the given remote host that can be passed (as `connection`) to `ssh()`, `scp_to()`,
+    and `scp_from()`, so that a whole series of them shares one connection rather than each of them opening
+    (and authenticating) their own.
+
+    Use it as a context manager so that the session gets closed once you are done with it.
+    """
+    return _connect(ip, uname, password)
+
+def _connect(ip: str, uname: str, password: str) -> fabric.Connection:
+    """
+    Create a (not yet opened) connection to the given remote host.
+    """
+    return fabric.Connection(ip, uname, forward_agent=True, connect_timeout=30, connect_kwargs={'password': password})
+
 def _resolve_hostname(user_input: str) -> str:
     """
     Resolve the given raw user input (which may be an IP address or a hostname) to an IP address.
@@ -456,12 +506,14 @@ def validate_input_ip(user_input: str) -> str:
         raise argparse.ArgumentError()
     return ip
 
-def verify_ssh_connection(ip: str, uname: str, password: str) -> Tuple[bool, Exception|None]:
+def verify_ssh_connection(ip: str, uname: str, password: str, connection: fabric.Connection|None=None) -> Tuple[bool, Exception|None]:
     """
     Return whether we can access the given IP address with the given credentials or not.
     If we can't, we return the exception we got while trying (if any).
+
+    If `connection` is given (see `ssh_session()`), we check that one, which is then left open for the caller to keep using.
     """
-    c = fabric.Connection(ip, uname, forward_agent=True, connect_timeout=30, connect_kwargs={'password': password})
+    c = connection if connection is not None else _connect(ip, uname, password)
     try:
         c.run("echo 'testing connection to Artie from Artie Tool'", timeout=30, hide=True)
         return True, None
@@ -2,7 +2,7 @@
 Machinery for handling Docker containers.
 """
 from . import common
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 import json
 import logging
 import os
@@ -24,6 +24,13 @@ except ModuleNotFoundError:
 
 API_CALL_TIMEOUT_S = 600
 
+# Environment variable we tag each exec'd command (and so all of its children) with, so that we can find and kill it later
+_EXEC_TOKEN_VAR = "ARTIE_TOOL_EXEC_TOKEN"
+
+# Shell script that SIGKILLs every process in a container whose environment contains the "VAR=token" given as $0.
+# Docker has no way to kill an exec'd process, and the PID it gives us is the host's, not the container's.
+_KILL_EXEC_SCRIPT = 'for f in /proc/[0-9]*/environ; do if 2>/dev/null tr "\\0" "\\n" < "$f" | grep -qx "$0"; then p="${f#/proc/}"; kill -KILL "${p%/environ}" 2>/dev/null; fi; done'
+
 class DockerImageName:
     def __init__(self, repo: str, name: str, tag: str) -> None:
         self.repo = repo
@@ -90,6 +97,87 @@ class DockerRunner:
     def get_container_output(self):
         return self.container_output
 
+class DockerExecRunner:
+    """
+    Like `DockerRunner`, but runs the command inside an already-running Docker container
+    (via 'docker exec') rather than paying to create and start a whole new container for it.
+
+    Whatever way we stop waiting on the command before it finishes (stop signal, `stop_when`, or a timeout
+    followed by a call to `kill()`), we kill it, just like `DockerRunner` stops its container,
+    so that it doesn't carry on in the background of a container that other commands share.
+    """
+    def __init__(self, client: docker.DockerClient, container: Container, cmd: str, stop_when: Callable[[bytes], bool]|None=None, **kwargs) -> None:
+        self.client = client
+        self.container = container
+        self.cmd = cmd
+        self.stop_when = stop_when
+        self.kwargs = kwargs
+        self.stop_event = False
+        self.exec_output = None
+        self._token = ''.join(random.choices(string.ascii_letters, k=16))
+        self._exec_id = None
+        self._killed = False
+        self._done = False  # Set once we know the command isn't running anymore
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        common.info(f"Executing command {self.cmd} in Docker container {self.container.id}...")
+        kwargs = dict(self.kwargs)
+        environment = kwargs.pop('environment', None) or {}
+        if isinstance(environment, dict):
+            environment = {**environment, _EXEC_TOKEN_VAR: self._token}
+        else:
+            environment = list(environment) + [f"{_EXEC_TOKEN_VAR}={self._token}"]
+
+        output = []
+        with self._lock:
+            if self._killed:
+                return
+            self._exec_id = self.client.api.exec_create(self.container.id, self.cmd, stdout=True, stderr=True, environment=environment, **kwargs)['Id']
+            stream = self.client.api.exec_start(self._exec_id, stream=True)
+
+        try:
+            for chunk in stream:
+                output.append(chunk)
+                if self.stop_event:
+                    common.info(f"Stop signal received while executing command {self.cmd} in Docker container {self.container.id}.")
+                    break
+                elif self.stop_when is not None and self.stop_when(chunk):
+                    common.info(f"Got all the output we need from command {self.cmd} in Docker container {self.container.id}. Not waiting for it to finish.")
+                    break
+            else:
+                self._done = True
+        finally:
+            if not self._done:
+                self.kill()
+
+        self.exec_output = b"".join(output)
+        common.info(f"Finished executing command {self.cmd} in Docker container {self.container.id}.")
+
+    def kill(self):
+        """
+        Kill the command (and anything it started) if it is still running. Safe to call more than once,
+        from any thread, and before the command has even started (in which case it never will).
+        """
+        with self._lock:
+            self._killed = True
+            exec_id = self._exec_id
+        if exec_id is None or self._done:
+            return
+
+        try:
+            if not self.client.api.exec_inspect(exec_id).get('Running'):
+                return
+            common.info(f"Killing command {self.cmd} in Docker container {self.container.id}...")
+            kill_id = self.client.api.exec_create(self.container.id, ["sh", "-c", _KILL_EXEC_SCRIPT, f"{_EXEC_TOKEN_VAR}={self._token}"])['Id']
+            self.client.api.exec_start(kill_id)
+            self._done = True
+        except docker_errors.APIError as e:
+            common.warning(f"Could not kill command {self.cmd} in Docker container {self.container.id}. It may still be running. Exception: {e}")
+
+    def get_exec_output(self):
+        return self.exec_output
+
 def _get_cidfile_path():
     """
     Return a location to put a Docker invocation's cidfile.
@@ -528,6 +616,16 @@ def get_container(name_or_pid: str) -> Container:
         ret = None
     return ret
 
+def list_containers(compose_project: str=None) -> List[Container]:
+    """
+    Returns a list of Container objects (including stopped ones) in a single API call.
+
+    If `compose_project` is given, we only return the containers that belong to that Docker compose project.
+    """
+    client = docker.from_env(timeout=API_CALL_TIMEOUT_S)
+    filters = {'label': f"com.docker.compose.project={compose_project}"} if compose_project is not None else None
+    return client.containers.list(all=True, filters=filters)
+
 def docker_login(args):
     """
     Log in to the Docker API.
@@ -713,6 +811,43 @@ def run_docker_container(image_name, cmd: str|None, timeout_s=30, log_to_stdout=
 
     return stdout
 
+def exec_in_docker_container(container: Container, cmd: str, timeout_s=30, log_to_stdout=False, stop_when: Callable[[bytes], bool]|None=None, decode=True, **kwargs):
+    """
+    Like `run_docker_container()`, but runs the command inside the given (already running) container
+    instead of starting a new one. Runs to completion before returning (or it times out, or `stop_when` tells us to stop early).
+
+    Returns the combined stdout and stderr of the command (as raw bytes if `decode` is False).
+
+    Args
+    ----
+    - container: The running Container to execute the command in
+    - cmd: The command to run inside the Docker container
+    - timeout_s: Timeout in seconds.
+    - log_to_stdout: If given, we log the command's output to the console.
+    - stop_when: If given, this is called with each chunk of output as it comes in. If it returns True,
+                 we stop waiting on the command and return the output we have so far.
+    - decode: If True (the default), we decode the output into a string before returning it. Callers that only
+              search the output (or ignore it) can pass False to skip that.
+    - kwargs: Additional kwargs to pass onto the Docker SDK's exec_create.
+    """
+    client = docker.from_env(timeout=API_CALL_TIMEOUT_S)
+    common.info(f"Executing command: {cmd} ; using kwargs: {kwargs}")
+    runner = DockerExecRunner(client, container, cmd, stop_when=stop_when, **kwargs)
+    try:
+        common.manage_timeout(runner, timeout_s)
+    finally:
+        # If we timed out, the command is still going; don't leave it running alongside whatever runs next
+        runner.kill()
+    stdout = runner.get_exec_output()
+
+    if log_to_stdout and stdout is not None:
+        common.info(f"Docker output: {stdout.decode(errors='replace')}")
+
+    if decode and stdout is not None:
+        stdout = stdout.decode()
+
+    return stdout
+
 def stop_docker_container(image_id):
     """
     Stops the given Docker container if it is running. Does nothing if it isn't.
@@ -4,8 +4,8 @@ from .. import kube
 from . import artifact
 from . import job
 from . import result
-import datetime
 import enum
+import time
 
 class DeploymentConfigurations(enum.StrEnum):
     """
@@ -92,10 +92,13 @@ class AddDeployJob(job.Job):
 
         timeout_s = 60 * 5
         common.info(f"Verifying deployment of {self.what}. This will timeout after {timeout_s/60:.2f} minutes if we don't succeed by then...")
-        start = datetime.datetime.now().timestamp()
+        deadline = time.monotonic() + timeout_s
         success = False
-        while datetime.datetime.now().timestamp() - start <= timeout_s and not success:
-            success = kube.check_if_helm_chart_is_deployed(args, self.chart_name)
+        while time.monotonic() <= deadline and not success:
+            # We're waiting for the answer to change, so don't settle for one Helm gave us a while ago
+            success = kube.check_if_helm_chart_is_deployed(args, self.chart_name, fresh=True)
+            if not success:
+                time.sleep(1)
 
         if not success:
             raise RuntimeError("Helm chart was deployed, but we can't find it after deployment for some reason.")
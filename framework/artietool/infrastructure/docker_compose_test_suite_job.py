@@ -6,10 +6,63 @@ from . import result
 from . import test_job
 from .. import common
 from .. import docker
-import datetime
+import concurrent.futures
+import mmap
 import os
+import time
 import yaml
 
+# Environment variables we want to extract from compose files for CLI containers
+_TARGET_ENV_VARS = frozenset([
+    'ARTIE_PUBSUB_BROKER_HOSTNAME',
+    'ARTIE_PUBSUB_BROKER_PORT',
+    'ARTIE_PUBSUB_USE_SSL',
+    'ARTIE_SERVICE_BROKER_HOSTNAME',
+    'ARTIE_SERVICE_BROKER_PORT',
+])
+
+# Every one of _TARGET_ENV_VARS starts with this, so a compose file without it has nothing for us
+_TARGET_ENV_VAR_PREFIX = b'ARTIE_'
+
+# Buffer size to use when writing Docker logs to disk, so that large logs are written in as few syscalls as possible
+_LOG_WRITE_BUFFER_SIZE = 1 << 20
+
+# Use the libyaml-backed loader if PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def _load_service_environments(stream) -> Dict[str, list|dict]:
+    """
+    Return a dict of service name to that service's 'environment' section from the given compose file stream.
+
+    Only the 'environment' sections are turned into Python objects - the rest of the document
+    is only composed into YAML nodes, which we walk to find what we need. Merge keys (`<<: *anchor`)
+    are resolved along the way, just as they would be if we loaded the whole thing.
+    """
+    loader = _YAML_LOADER(stream)
+    try:
+        root = loader.get_single_node()
+        if not isinstance(root, yaml.MappingNode):
+            return {}
+        loader.flatten_mapping(root)
+
+        services = next((v for k, v in root.value if k.value == 'services'), None)
+        if not isinstance(services, yaml.MappingNode):
+            return {}
+        loader.flatten_mapping(services)
+
+        environments = {}
+        for service_name_node, service_node in services.value:
+            if not isinstance(service_node, yaml.MappingNode):
+                continue
+            loader.flatten_mapping(service_node)
+
+            for k, v in service_node.value:
+                if k.value == 'environment':
+                    environments[service_name_node.value] = loader.construct_object(v, deep=True)
+        return environments
+    finally:
+        loader.dispose()
+
 class DockerComposeTestSuiteJob(test_job.TestJob):
     def __init__(self, steps: List[test_job.CLITest], compose_fname: str, compose_docker_image_variables: List[Tuple[str, str|dependency.Dependency]], docker_network_name: str) -> None:
         super().__init__(artifacts=[], steps=steps)
@@ -40,28 +93,22 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
             return {}
 
         try:
-            with open(compose_fpath, 'r') as f:
-                compose_config = yaml.safe_load(f)
+            # Map the file rather than reading it in, so we can skip parsing it altogether if it can't have anything we want
+            with open(compose_fpath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return {}
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(_TARGET_ENV_VAR_PREFIX) == -1:
+                        return {}
+                    service_environments = _load_service_environments(mm)
         except Exception as e:
             common.warning(f"Failed to parse compose file {compose_fpath}: {e}")
             return {}
 
-        # Environment variables we want to extract for CLI
-        target_env_vars = [
-            'ARTIE_PUBSUB_BROKER_HOSTNAME',
-            'ARTIE_PUBSUB_BROKER_PORT',
-            'ARTIE_PUBSUB_USE_SSL',
-            'ARTIE_SERVICE_BROKER_HOSTNAME',
-            'ARTIE_SERVICE_BROKER_PORT',
-        ]
-
         extracted_env = {}
 
         # Look through all services to find the target environment variables
-        services = compose_config.get('services', {})
-        for service_name, service_config in services.items():
-            env_list = service_config.get('environment', [])
-
+        for service_name, env_list in service_environments.items():
             # Environment can be either a list or a dict
             if isinstance(env_list, list):
                 for env_item in env_list:
@@ -69,16 +116,16 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
                         # Format: "KEY=VALUE"
                         if '=' in env_item:
                             key, value = env_item.split('=', 1)
-                            if key in target_env_vars:
+                            if key in _TARGET_ENV_VARS:
                                 extracted_env[key] = value
                     elif isinstance(env_item, dict):
                         # Format: {KEY: VALUE}
                         for key, value in env_item.items():
-                            if key in target_env_vars:
+                            if key in _TARGET_ENV_VARS:
                                 extracted_env[key] = str(value)
             elif isinstance(env_list, dict):
                 for key, value in env_list.items():
-                    if key in target_env_vars:
+                    if key in _TARGET_ENV_VARS:
                         extracted_env[key] = str(value)
 
         if extracted_env:
@@ -86,11 +133,10 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
 
         return extracted_env
 
-    def _get_logs(self, container_id: str) -> str:
+    def _get_logs(self, container_id: str, container: docker.Container|None) -> bytes:
         """
-        Fetch logs from a Docker container using its ID.
+        Fetch the raw logs from the given Docker container, which has the given ID.
         """
-        container = docker.get_container(container_id)
         if container is None:
             raise ValueError(f"Container with ID {container_id} not found when trying to fetch logs.")
 
@@ -99,24 +145,40 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
         except docker.docker_errors.NotFound:
             raise ValueError(f"Container with ID {container_id} closed unexpectedly while reading its logs.")
 
-        return logs.decode('utf-8')
+        return logs
 
     def log_failures(self, args):
         """
         If the test failed, fetch logs from the Docker containers to help with debugging.
         """
+        if not self._dut_pids:
+            common.info(f"Test failed, but there are no Docker containers to fetch logs from.")
+            return
+
         common.info(f"Test failed, fetching logs from Docker containers for debugging...")
 
         # Make a directory inside the artifacts directory for this test to store the logs
         logs_dir = os.path.join(args.artifact_folder, "docker_logs")
         os.makedirs(logs_dir, exist_ok=True)
+
+        # Grab all of this project's containers at once, rather than asking the daemon for each one.
+        # Docker compose may report either the full or the short container ID, so index by both.
+        containers = {}
+        try:
+            for container in docker.list_containers(compose_project=self.project_name):
+                containers[container.id] = container
+                containers[container.short_id] = container
+        except Exception as e:
+            common.error(f"Error listing Docker containers for project {self.project_name}: {e}")
+
+        # All the logs are captured at the same moment, so they all share a single timestamp
+        timestamp = time.strftime("%y-%b-%d-%H.%M.%S", time.localtime())
         for dut_name, pid in self._dut_pids.items():
             try:
                 common.info(f"Fetching logs from {dut_name} (container ID: {pid})...")
-                logs = self._get_logs(pid)
-                timestamp = datetime.datetime.now().strftime("%y-%b-%d-%H.%M.%S")
+                logs = self._get_logs(pid, containers.get(pid))
                 log_file_path = os.path.join(logs_dir, f"{timestamp}_{dut_name}_{pid}.log")
-                with open(log_file_path, "w") as log_file:
+                with open(log_file_path, "wb", buffering=_LOG_WRITE_BUFFER_SIZE) as log_file:
                     log_file.write(logs)
                 common.info(f"Logs from {dut_name} (container ID: {pid}) saved to {log_file_path}")
             except Exception as e:
@@ -156,15 +218,27 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
 
         docker.add_network(self.docker_network_name)
         self._set_compose_variables(args)
-        self._dut_pids = docker.compose(self.project_name, self.compose_dpath, self.compose_fname, args.test_timeout_s, envs=self.compose_variables)
 
-        # Extract environment variables from compose file and set them on all CLI tests
-        cli_environment = self._extract_cli_environment_from_compose()
+        # Extract environment variables from the compose file while we wait on the Docker daemon to bring the project up
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            cli_environment_future = executor.submit(self._extract_cli_environment_from_compose)
+            self._dut_pids = docker.compose(self.project_name, self.compose_dpath, self.compose_fname, args.test_timeout_s, envs=self.compose_variables)
+            cli_environment = cli_environment_future.result()
+
+        # Set the extracted environment variables on all CLI tests
         for step in self.steps:
             step.link_pids_to_expected_outs(args, self._dut_pids)
             # Merge extracted environment with any existing environment in the test
             # Test-specific environment takes precedence
             step.environment = {**cli_environment, **step.environment}
+            # Now that the environment is final, build the CLI image and Docker kwargs for this test once, up front
+            step._docker_context(args)
+
+        # Start reading the DUTs' logs now, rather than replaying all of it when each test first checks them
+        try:
+            self._start_log_taps(docker.list_containers(compose_project=self.project_name))
+        except Exception as e:
+            common.warning(f"Could not start following the logs of project {self.project_name}'s containers ahead of time. Tests will read them as they go: {e}")
 
     def teardown(self, args, results: list[result.TestResult]):
         """
@@ -176,7 +250,7 @@ class DockerComposeTestSuiteJob(test_job.TestJob):
 
         try:
             common.debug(f"Tearing down Docker compose project {self.project_name} with compose file {self.compose_fname} at {self.compose_dpath}...")
-            if results and any(r.status.value == result.TestStatuses.FAIL.value for r in results):
+            if results and any(r.status is result.TestStatuses.FAIL for r in results):
                 self.log_failures(args)
             super().teardown(args, results)
             docker.compose_down(self.project_name, self.compose_dpath, self.compose_fname, envs=self.compose_variables)
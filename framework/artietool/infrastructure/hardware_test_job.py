@@ -45,7 +45,6 @@ from .. import common
 from .. import docker
 from .. import kube
 import os
-import time
 
 class CollectedHardwareTestSteps:
     """
@@ -79,12 +78,7 @@ class CollectedHardwareTestSteps:
 
         # Check the job status
         common.info("Waiting until K8s test job completes...")
-        status = kube.check_job_status(args, self.job_name)
-        while status == kube.JobStatuses.INCOMPLETE or status == kube.JobStatuses.UNKNOWN:
-            time.sleep(5)
-            status = kube.check_job_status(args, self.job_name)
-
-        job_status = kube.check_job_status(args, self.job_name)
+        job_status = kube.wait_for_job(args, self.job_name)
         if job_status == kube.JobStatuses.FAILED:
             common.error(f"HW Job failed, the logs from the HW test job follow:")
             kube.log_job_results(args, self.job_name)
@@ -120,7 +120,7 @@ class TaskResult:
         for r in self.job_results:
             if hasattr(r, 'success') and not r.success:
                 self.success = False
-            elif hasattr(r, 'status') and r.status == TestStatuses.FAIL:
+            elif hasattr(r, 'status') and r.status is TestStatuses.FAIL:
                 self.success = False
 
     def __repr__(self):
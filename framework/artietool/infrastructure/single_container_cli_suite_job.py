@@ -5,8 +5,27 @@ from . import result
 from . import test_job
 from .. import common
 from .. import docker
+import socket
 import time
 
+def _host_port_is_ready(port: int) -> bool:
+    """
+    Returns whether something is accepting connections on the given port on this machine.
+
+    Docker's userland proxy accepts connections on a mapped port even when nothing in the container
+    is listening yet - it just hangs up on us right away. So we only count the port as ready if the connection
+    stays open (or we get sent some data).
+    """
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.25) as sock:
+            sock.settimeout(0.25)
+            try:
+                return sock.recv(1) != b""
+            except socket.timeout:
+                return True
+    except OSError:
+        return False
+
 class SingleContainerCLISuiteJob(test_job.TestJob):
     def __init__(self, steps: List[test_job.CLITest], docker_image_under_test: str | dependency.Dependency, cmd_to_run_in_dut: str|None, dut_port_mappings: Dict[int, int]) -> None:
         super().__init__(artifacts=[], steps=steps)
@@ -25,14 +44,40 @@ class SingleContainerCLISuiteJob(test_job.TestJob):
         else:
             docker_image_name = str(docker.construct_docker_image_name(args, self.dut, common.host_platform()))
 
+        # Resolve each step's CLI image up front, one after the other, so the steps don't have to do it
+        # once the DUT is already up and running (and so a bad image fails us before we start anything)
+        for step in self.steps:
+            step._docker_context(args)
+
         kwargs = {'environment': {'ARTIE_RUN_MODE': 'unit'}, 'ports': self.dut_port_mappings}
         self._dut_container = docker.start_docker_container(docker_image_name, self.cmd_to_run_in_dut, **kwargs)
+        pids = {docker_image_name: self._dut_container.id}
         for step in self.steps:
-            step.link_pids_to_expected_outs(args, {docker_image_name: self._dut_container.id})
+            step.link_pids_to_expected_outs(args, pids)
+        self._start_log_taps([self._dut_container])
 
         # Give some time for the container to initialize before we start testing it
         common.info("Waiting for DUT to come online...")
-        time.sleep(min(args.test_timeout_s / 3, 10))
+        self._wait_for_dut_ready(min(args.test_timeout_s / 3, 10))
+
+    def _wait_for_dut_ready(self, max_wait_s: float):
+        """
+        Wait until every port we mapped from the DUT to the host is accepting connections, or until `max_wait_s` seconds
+        have passed, whichever comes first. If we didn't map any ports, we have no way of telling, so we just wait the whole time.
+        """
+        host_ports = list(self.dut_port_mappings.values())
+        if not host_ports:
+            time.sleep(max_wait_s)
+            return
+
+        start = time.monotonic()
+        while time.monotonic() - start < max_wait_s:
+            if all(_host_port_is_ready(port) for port in host_ports):
+                common.info(f"DUT is accepting connections after {time.monotonic() - start:.1f} seconds.")
+                return
+            time.sleep(0.1)
+
+        common.warning(f"DUT is still not accepting connections on all of {host_ports} after {max_wait_s} seconds. Continuing anyway.")
 
     def teardown(self, args, results: list[result.TestResult]):
         """
@@ -25,6 +25,9 @@ import os
 import re
 import yaml
 
+# Use the libyaml-backed loader if PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
 @unique
 class TaskTypes(StrEnum):
     """
@@ -505,7 +508,8 @@ def _import_unit_test_job(job_def: Dict, fpath: str) -> test_job.CLITest:
         test_name = _replace_variables(sdef['test-name'], fpath, {"DUT": dut, "CLI": cli_image})
         cli_cmd = _replace_variables(sdef['cmd-to-run-in-cli'], fpath, {"DUT": dut})
         expected_outputs = _import_expected_outputs(sdef, fpath, {'DUT': dut, 'CLI': cli_image})
-        cli_test_steps.append(test_job.CLITest(test_name, cli_image, cli_cmd, expected_outputs))
+        parallel_group = sdef.get('parallel-group', None)
+        cli_test_steps.append(test_job.CLITest(test_name, cli_image, cli_cmd, expected_outputs, parallel_group=parallel_group))
     return single_container_cli_suite_job.SingleContainerCLISuiteJob(cli_test_steps, dut, cmd_to_run_in_dut, dut_port_mappings)
 
 def _import_docker_compose_variables(config: Dict, fpath: str, cli: str) -> List[Tuple[str, str]]:
@@ -531,7 +535,7 @@ def _import_compose_network_name(compose_fname: str) -> str:
     compose_dpath = os.path.join(common.repo_root(), "framework", "artietool", "compose-files")
     compose_fpath = os.path.join(compose_dpath, compose_fname)
     with open(compose_fpath, 'r') as f:
-        compose_config = yaml.load(f, yaml.FullLoader)
+        compose_config = yaml.load(f, _YAML_LOADER)
     _validate_dict(compose_config, 'name', keyerrmsg=f"Missing 'name' in docker compose file {compose_fpath}")
     _validate_dict(compose_config, 'networks', keyerrmsg=f"Missing 'networks' section in docker compose file {compose_fpath}; need a network to attach to.")
     if len([k for k in compose_config['networks'].keys()]) != 1:
@@ -552,6 +556,7 @@ def _import_integration_test_job(job_def: Dict, fpath: str) -> docker_compose_te
     for sdef in steps_def:
         _validate_dict(sdef, 'test-name', keyerrmsg=f"Missing 'test-name' from 'steps' section in {fpath}")
         test_name = _replace_variables(sdef['test-name'], fpath, {"CLI": cli_image})
+        parallel_group = sdef.get('parallel-group', None)
 
         # Check if this uses parallel-cmds or cmd-to-run-in-cli
         if 'parallel-cmds' in sdef and 'cmd-to-run-in-cli' in sdef:
@@ -592,8 +597,10 @@ def _import_integration_test_job(job_def: Dict, fpath: str) -> docker_compose_te
             teardown_cmds = []
             if 'teardown-cmds' in sdef:
                 teardown_cmds = [_replace_variables(cmd, fpath, {"CLI": cli_image}) for cmd in sdef['teardown-cmds']]
+            parallel_setup = sdef.get('parallel-setup-cmds', False)
+            parallel_teardown = sdef.get('parallel-teardown-cmds', False)
 
-            cli_test_steps.append(test_job.CLITest(test_name, cli_image, parallel_cmds=parallel_cmds, network=network, setup_cmds=setup_cmds, teardown_cmds=teardown_cmds))
+            cli_test_steps.append(test_job.CLITest(test_name, cli_image, parallel_cmds=parallel_cmds, network=network, setup_cmds=setup_cmds, teardown_cmds=teardown_cmds, parallel_setup=parallel_setup, parallel_teardown=parallel_teardown, parallel_group=parallel_group))
         else:
             # Traditional single command path
             _validate_dict(sdef, 'cmd-to-run-in-cli', keyerrmsg=f"Missing 'cmd-to-run-in-cli' from 'steps' section in {fpath}")
@@ -610,8 +617,10 @@ def _import_integration_test_job(job_def: Dict, fpath: str) -> docker_compose_te
             teardown_cmds = []
             if 'teardown-cmds' in sdef:
                 teardown_cmds = [_replace_variables(cmd, fpath, {"CLI": cli_image}) for cmd in sdef['teardown-cmds']]
+            parallel_setup = sdef.get('parallel-setup-cmds', False)
+            parallel_teardown = sdef.get('parallel-teardown-cmds', False)
 
-            cli_test_steps.append(test_job.CLITest(test_name, cli_image, cli_cmd, expected_outputs, network=network, setup_cmds=setup_cmds, teardown_cmds=teardown_cmds, unexpected_outputs=unexpected_outputs))
+            cli_test_steps.append(test_job.CLITest(test_name, cli_image, cli_cmd, expected_outputs, network=network, setup_cmds=setup_cmds, teardown_cmds=teardown_cmds, parallel_setup=parallel_setup, parallel_teardown=parallel_teardown, unexpected_outputs=unexpected_outputs, parallel_group=parallel_group))
     return docker_compose_test_suite_job.DockerComposeTestSuiteJob(cli_test_steps, compose_fname, compose_docker_image_variables, network)
 
 def _import_hardware_test_job(job_def: Dict, fpath: str) -> hardware_test_job.HardwareTestJob:
@@ -705,7 +714,7 @@ def _import_task(fpath: str) -> task.Task:
     """
     try:
         with open(fpath, 'r') as f:
-            task_config = yaml.load(f, yaml.FullLoader)
+            task_config = yaml.load(f, _YAML_LOADER)
 
         _validate_dict(task_config, 'type')
         _validate_dict(task_config, 'steps')
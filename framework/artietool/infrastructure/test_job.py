@@ -1,5 +1,8 @@
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Tuple
 from . import artifact
 from . import dependency
 from . import job
@@ -7,22 +10,114 @@ from . import result
 from .. import common
 from .. import docker
 from dataclasses import dataclass
-from enum import Enum
-from enum import unique
-import datetime
+import concurrent.futures
+import itertools
 import os
 import threading
 import time
 import traceback
 
-@unique
-class TestStatuses(Enum):
+# The most Docker commands we will run at once. The Docker daemon gets bogged down
+# (and can even start failing requests) when asked to do too many things concurrently.
+_MAX_CONCURRENT_DOCKER_CMDS = 10
+
+# One slot for each of the above. Every Docker command we run in parallel (setup and teardown commands on the pool below,
+# and each test's parallel-cmds) holds a slot while it runs, so that the limit holds no matter how many tests are running commands at once.
+_DOCKER_CMD_SLOTS = threading.Semaphore(_MAX_CONCURRENT_DOCKER_CMDS)
+# Held while taking slots, so that two tests can't each grab some of the slots the other one needs and then wait on each other forever
+_DOCKER_CMD_SLOTS_LOCK = threading.Lock()
+
+# Shared across all tests, so that we aren't spinning up (and tearing down) a fresh set of threads for every test.
+# The executor only starts threads as it needs them. Only for commands that don't need each other to be running
+# (setup and teardown); a test's parallel-cmds may, so each test runs those on threads of its own (see `_acquire_docker_cmd_slots()`).
+_DOCKER_CMD_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_DOCKER_CMDS, thread_name_prefix="docker-cmd")
+
+# How long to wait on one event at a time when we need to notice either of two of them getting set
+_STOP_POLL_INTERVAL_S = 0.05
+
+# How many stack frames to show when logging a test's exception with --enable-error-tracing
+_MAX_TRACEBACK_FRAMES = 20
+
+# Errors that running a CLI command again won't fix (a missing image, a bad argument, a mistake in the test itself),
+# so there's no point in retrying the command when we get one of them.
+_NON_TRANSIENT_CLI_ERRORS = (docker.docker_errors.ImageNotFound, docker.docker_errors.InvalidArgument, ValueError, KeyError)
+
+# The most of any one DUT container's logs that we hold onto (see ContainerLogTap). Once a tap's buffer grows past this,
+# the oldest logs get dropped, so checks that start after that only see the most recent this-many bytes.
+_MAX_LOG_TAP_BUFFER_BYTES = 64 * 1024 * 1024
+
+# Process-wide cache of evaluated CLI image names, keyed by whatever identifies the unevaluated image.
+# If several tests try to evaluate the same image at once, only one of them does the work and the rest wait on it.
+_CLI_IMAGE_LOCK = threading.Lock()
+_CLI_IMAGE_RESULTS: Dict[Tuple, str] = {}
+_CLI_IMAGE_IN_FLIGHT: Dict[Tuple, threading.Event] = {}
+
+def _evaluate_cli_image_once(key: Tuple, evaluate: Callable[[], str]) -> str:
+    """
+    Return the cached CLI image for `key`, calling `evaluate` to fill it in if nobody has yet.
+
+    If the evaluation fails, the exception propagates to whoever was doing it, and anyone waiting on it
+    tries the evaluation for themselves rather than waiting forever.
     """
-    These are the allowable status values for a test result.
+    with _CLI_IMAGE_LOCK:
+        if key in _CLI_IMAGE_RESULTS:
+            return _CLI_IMAGE_RESULTS[key]
+
+        event = _CLI_IMAGE_IN_FLIGHT.get(key)
+        we_evaluate = event is None
+        if we_evaluate:
+            event = threading.Event()
+            _CLI_IMAGE_IN_FLIGHT[key] = event
+
+    if not we_evaluate:
+        event.wait()
+        with _CLI_IMAGE_LOCK:
+            if key in _CLI_IMAGE_RESULTS:
+                return _CLI_IMAGE_RESULTS[key]
+        # Whoever was evaluating it failed. Give it a shot ourselves.
+        return evaluate()
+
+    try:
+        cli_img = evaluate()
+        with _CLI_IMAGE_LOCK:
+            _CLI_IMAGE_RESULTS[key] = cli_img
+        return cli_img
+    finally:
+        with _CLI_IMAGE_LOCK:
+            del _CLI_IMAGE_IN_FLIGHT[key]
+        event.set()
+
+def _acquire_docker_cmd_slots(n: int) -> int:
+    """
+    Take `n` of the `_MAX_CONCURRENT_DOCKER_CMDS` slots all at once, waiting for enough of them to free up if need be.
+    Asking for more slots than there are takes all of them, so a test with more parallel-cmds than the limit still
+    gets to run them all at once, just with nothing else running alongside them.
+
+    Returns how many slots were taken, which is what should be handed to `_release_docker_cmd_slots()` once done.
     """
-    SUCCESS = 0
-    FAIL = 1
-    DID_NOT_RUN = 2
+    n = min(n, _MAX_CONCURRENT_DOCKER_CMDS)
+    with _DOCKER_CMD_SLOTS_LOCK:
+        for _ in range(n):
+            _DOCKER_CMD_SLOTS.acquire()
+    return n
+
+def _release_docker_cmd_slots(n: int):
+    """
+    Give back slots taken with `_acquire_docker_cmd_slots()`.
+    """
+    _DOCKER_CMD_SLOTS.release(n)
+
+def _submit_docker_cmd(fn: Callable, *args) -> concurrent.futures.Future:
+    """
+    Run `fn(*args)` on the shared pool, holding one slot for as long as it runs.
+    """
+    def run():
+        nslots = _acquire_docker_cmd_slots(1)
+        try:
+            return fn(*args)
+        finally:
+            _release_docker_cmd_slots(nslots)
+    return _DOCKER_CMD_POOL.submit(run)
 
 @dataclass
 class ParallelCommand:
@@ -36,6 +131,52 @@ class ParallelCommand:
     def __post_init__(self):
         if self.unexpected_outputs is None:
             self.unexpected_outputs = []
+        # Built once up front and reset before each run, so each run doesn't have to re-encode all of our outputs
+        self.scanner = OutputScanner([e.what for e in self.expected_outputs], [u.what for u in self.unexpected_outputs])
+
+class OutputScanner:
+    """
+    Watches a stream of output chunks for a set of expected and unexpected strings as the chunks come in,
+    so that each chunk only gets scanned once and we know as soon as everything we're waiting for has shown up.
+    """
+    def __init__(self, expected: List[str], unexpected: List[str]=None) -> None:
+        self.expected = list(expected)
+        self.unexpected = list(unexpected) if unexpected else []
+        self._needles = {what: what.encode() for what in itertools.chain(self.expected, self.unexpected)}
+        # Keep enough of the end of each chunk around to catch strings that straddle two chunks
+        self._overlap = max((len(needle) for needle in self._needles.values()), default=1) - 1
+        self.reset()
+
+    def reset(self):
+        """
+        Forget everything we've seen so far (e.g., because the command is being retried).
+        """
+        self._tail = b""
+        self.found = set()
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Scan the next chunk of output. Returns whether we can stop reading, which is only the case if
+        all the expected strings have been seen and there are no unexpected strings to keep watching for.
+        """
+        # Only the seam between the last chunk and this one needs gluing together; the chunk
+        # itself gets searched in place rather than copied into a new buffer first.
+        seam = self._tail + chunk[:self._overlap] if self._tail else b""
+        for what, needle in self._needles.items():
+            if what not in self.found and (needle in chunk or needle in seam):
+                self.found.add(what)
+
+        if not self._overlap:
+            self._tail = b""
+        elif len(chunk) >= self._overlap:
+            self._tail = chunk[-self._overlap:]
+        else:
+            self._tail = (self._tail + chunk)[-self._overlap:]
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        return bool(self.expected) and not self.unexpected and all(what in self.found for what in self.expected)
 
 class ExpectedOutput:
     """
@@ -43,18 +184,28 @@ class ExpectedOutput:
     """
     def __init__(self, what: str, where: str | dependency.Dependency, cli=False) -> None:
         self.what = what
+        self._what_bytes = what.encode()  # Container logs come to us as bytes; no need to decode them just to search them
         self.where = where
         self.cli = cli  # is 'where' the CLI container? It gets treated differently than all the others
         self.pid = None  # Needs to be filled in by whoever launches the DUT(s)
+        self._cached_where = None  # See evaluated_where()
+        self._cached_where_args_id = None
 
     def evaluated_where(self, args) -> str:
         """
         Returns our `where`, after evaluating it if it is a dependency.
+
+        The result is computed once and reused for as long as we are given the same `args`.
         """
-        if issubclass(type(self.where), dependency.Dependency):
+        if self._cached_where is not None and self._cached_where_args_id == id(args):
+            return self._cached_where
+
+        if isinstance(self.where, dependency.Dependency):
             where = self.where.evaluate(args).item
         else:
             where = self.where
+        self._cached_where = where
+        self._cached_where_args_id = id(args)
         return where
 
     def check(self, args, test_name: str, task_name: str, timeout_s: float) -> result.TestResult|None:
@@ -64,37 +215,211 @@ class ExpectedOutput:
         if self.cli:
             return None
 
+        return MultiPatternChecker(self.pid, [self]).check(args, test_name, task_name, timeout_s)[0]
+
+    def check_in_logs(self, args, logs: bytes|str, test_name: str, task_name: str) -> result.TestResult:
+        """
+        Same as check, but uses logs to do the checking, instead of the where and is typically used for CLI containers.
+        The logs may be given as the raw bytes we got from Docker; there's no need to decode them first.
+        """
+        common.info(f"Checking {test_name}'s DUT(s) for '{self.what}' in logs...")
+        what = self._what_bytes if isinstance(logs, (bytes, bytearray)) else self.what
+        if what in logs:
+            return result.TestResult(test_name, task_name, result.TestStatuses.SUCCESS)
+        else:
+            return result.TestResult(test_name, task_name, result.TestStatuses.FAIL)
+
+class ContainerLogTap:
+    """
+    Follows a single DUT container's logs on a background thread, collecting them into a buffer that
+    any number of checkers (across any number of tests) can wait on and scan. This way each container's
+    log stream is only ever opened and read once, no matter how many times we check it.
+    """
+    _taps: Dict[str, "ContainerLogTap"] = {}
+    _taps_lock = threading.Lock()
+
+    def __init__(self, container) -> None:
+        self.container = container
+        self.buf = bytearray()
+        self.base = 0  # Where in the container's logs `buf` starts, once we've had to drop the oldest logs
+        self.finished = False  # Set once the log stream ends (e.g., the container exited)
+        self.exception = None  # Set if the log stream ended because of an error
+        self.cond = threading.Condition()
+        self._stream = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._read, name=f"log-tap-{container.name}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get_or_create(cls, container) -> "ContainerLogTap":
+        """
+        Returns the tap for the given container, starting one if there isn't one yet.
+        """
+        with cls._taps_lock:
+            tap = cls._taps.get(container.id)
+            if tap is None:
+                tap = ContainerLogTap(container)
+                cls._taps[container.id] = tap
+            return tap
+
+    @classmethod
+    def find(cls, pid: str) -> "ContainerLogTap|None":
+        """
+        Returns the tap for the container with the given (full or short) ID, if we have one.
+        """
+        if not pid:
+            return None
+
+        with cls._taps_lock:
+            tap = cls._taps.get(pid)
+            if tap is None:
+                tap = next((t for container_id, t in cls._taps.items() if container_id.startswith(pid)), None)
+            return tap
+
+    @classmethod
+    def close_all(cls):
+        """
+        Stop following the logs of every container we have a tap on and forget about them.
+        """
+        with cls._taps_lock:
+            taps = list(cls._taps.values())
+            cls._taps.clear()
+
+        for tap in taps:
+            tap.close()
+
+    def close(self):
+        """
+        Stop following this container's logs. If the stream isn't open yet, it gets closed as soon as it is.
+        """
+        with self.cond:
+            self._closed = True
+            stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception as e:
+                common.debug(f"Could not close log stream for container {self.container.name}: {e}")
+
+    def read_from(self, pos: int, deadline: float) -> Tuple[bytearray|None, int]:
+        """
+        Returns (a copy of) everything in the buffer past `pos` (a position in the container's logs), waiting until `deadline`
+        (a `time.monotonic()` value) for more to show up if there isn't anything yet, along with the position to read from next.
+        The data is an empty bytearray if the stream has ended and there is nothing more to read, or None if we hit the deadline.
+
+        If the logs at `pos` have already been dropped (see `_MAX_LOG_TAP_BUFFER_BYTES`), we start from the oldest ones we still have.
+
+        Whatever has piled up since the last read comes back as one batch, so a busy container's output gets
+        scanned in a few big pieces rather than one log line at a time.
+        """
+        with self.cond:
+            while self.base + len(self.buf) <= pos and not self.finished:
+                remaining_s = deadline - time.monotonic()
+                if remaining_s <= 0:
+                    return None, pos
+                self.cond.wait(remaining_s)
+
+            if pos < self.base:
+                common.warning(f"Some of {self.container.name}'s oldest logs were dropped to save memory before we could check them.")
+                pos = self.base
+            chunk = self.buf[pos - self.base:]
+            return chunk, pos + len(chunk)
+
+    def _read(self):
+        try:
+            stream = self.container.logs(stream=True, follow=True)
+            with self.cond:
+                self._stream = stream
+                closed = self._closed
+            if closed:
+                # We were closed while we were opening the stream
+                stream.close()
+                return
+
+            for chunk in stream:
+                with self.cond:
+                    self.buf += chunk
+                    if len(self.buf) > _MAX_LOG_TAP_BUFFER_BYTES:
+                        # Drop down to well below the limit, so that we aren't shuffling the whole buffer along for every chunk
+                        ndrop = len(self.buf) - (_MAX_LOG_TAP_BUFFER_BYTES * 3 // 4)
+                        common.warning(f"{self.container.name}'s logs have outgrown {_MAX_LOG_TAP_BUFFER_BYTES} bytes. Dropping the oldest {ndrop} bytes; any checks that haven't read them yet won't see them.")
+                        del self.buf[:ndrop]
+                        self.base += ndrop
+                    self.cond.notify_all()
+        except Exception as e:
+            self.exception = e
+        finally:
+            with self.cond:
+                self.finished = True
+                self.cond.notify_all()
+
+class MultiPatternChecker:
+    """
+    Checks a single DUT container's logs for any number of `ExpectedOutput`s at once, so that the
+    container's logs only get read once no matter how many strings we are looking for in them.
+    """
+    def __init__(self, pid: str, expected_outputs: List[ExpectedOutput]) -> None:
+        self.pid = pid
+        self.expected_outputs = expected_outputs
+
+    def check(self, args, test_name: str, task_name: str, timeout_s: float) -> List[result.TestResult]:
+        """
+        Returns one TestResult for each of our `ExpectedOutput`s, in the same order.
+        """
         common.info(f"Checking {test_name}'s DUT {self.pid} for output...")
-        container = docker.get_container(self.pid)
+        # Bound once here so the failure branches below don't each have to go back through evaluated_where()
+        wheres = [e.evaluated_where(args) for e in self.expected_outputs]
+
+        # If we are already following this container's logs, we have everything we need without asking Docker about it again
+        tap = ContainerLogTap.find(self.pid)
+        container = tap.container if tap is not None else docker.get_container(self.pid)
         if container is None:
-            return result.TestResult(test_name, producing_task_name=task_name, status=result.TestStatuses.FAIL, msg=f"Could not find container corresponding to {self.evaluated_where(args)}")
+            return [result.TestResult(test_name, producing_task_name=task_name, status=result.TestStatuses.FAIL, msg=f"Could not find container corresponding to {where}") for where in wheres]
 
-        timestamp = datetime.datetime.now().timestamp()
+        deadline = time.monotonic() + timeout_s
+        scanner = OutputScanner([e.what for e in self.expected_outputs])
         try:
-            common.info(f"Reading logs from {container.name} to find '{self.what}'...")
-            for line in container.logs(stream=True, follow=True):
+            if tap is None and container.status in ("exited", "dead"):
+                # Nothing more is coming, so grab everything there is in one go rather than following a stream
+                common.info(f"{container.name} has already stopped. Reading all of its logs at once to find {[e.what for e in self.expected_outputs]}...")
+                logs = container.logs(stream=False)
                 if args.docker_logs:
-                    common.info(line.decode())
+                    common.info(logs.decode(errors='replace'))
+                scanner.feed(logs)
+                return [self._result(e, scanner, test_name, task_name, msg=f"Container exited while we were waiting for '{e.what}' in {where}") for e, where in zip(self.expected_outputs, wheres)]
+
+            common.info(f"Reading logs from {container.name} to find {[e.what for e in self.expected_outputs]}...")
+            # The logs come in whatever chunks Docker wrote them in, which need not line up with
+            # lines (or with our strings), so scan them as a stream rather than one chunk at a time.
+            if tap is None:
+                tap = ContainerLogTap.get_or_create(container)
+            pos = 0
+            while True:
+                chunk, pos = tap.read_from(pos, deadline)
+                if chunk is None:
+                    return [self._result(e, scanner, test_name, task_name, exception=TimeoutError(f"Timeout waiting for '{e.what}' in {where}")) for e, where in zip(self.expected_outputs, wheres)]
+                elif not chunk and isinstance(tap.exception, docker.docker_errors.NotFound):
+                    return [self._result(e, scanner, test_name, task_name, msg=f"Container closed unexpectedly while reading its logs.") for e in self.expected_outputs]
+                elif not chunk:
+                    return [self._result(e, scanner, test_name, task_name, msg=f"Container exited while we were waiting for '{e.what}' in {where}") for e, where in zip(self.expected_outputs, wheres)]
 
-                if self.what in line.decode():
-                    return result.TestResult(test_name, producing_task_name=task_name, status=result.TestStatuses.SUCCESS)
+                if args.docker_logs:
+                    common.info(chunk.decode(errors='replace'))
 
-                if datetime.datetime.now().timestamp() - timestamp > timeout_s:
-                    return result.TestResult(test_name, producing_task_name=task_name, status=TestStatuses.FAIL, exception=TimeoutError(f"Timeout waiting for '{self.what}' in {self.evaluated_where(args)}"))
+                if scanner.feed(chunk):
+                    break
         except docker.docker_errors.NotFound:
-            return result.TestResult(test_name, producing_task_name=task_name, status=TestStatuses.FAIL, msg=f"Container closed unexpectedly while reading its logs.")
+            return [self._result(e, scanner, test_name, task_name, msg=f"Container closed unexpectedly while reading its logs.") for e in self.expected_outputs]
 
-        return result.TestResult(test_name, producing_task_name=task_name, status=TestStatuses.FAIL, msg=f"Container exited while we were waiting for '{self.what}' in {self.evaluated_where(args)}")
+        return [self._result(e, scanner, test_name, task_name) for e in self.expected_outputs]
 
-    def check_in_logs(self, args, logs: str, test_name: str, task_name: str) -> result.TestResult:
+    def _result(self, expected_out: ExpectedOutput, scanner: OutputScanner, test_name: str, task_name: str, msg: str=None, exception: Exception=None) -> result.TestResult:
         """
-        Same as check, but uses logs to do the checking, instead of the where and is typically used for CLI containers.
+        Returns SUCCESS if the scanner found the given expected output, otherwise a FAIL with the given message/exception.
         """
-        common.info(f"Checking {test_name}'s DUT(s) for '{self.what}' in logs...")
-        if self.what in logs:
-            return result.TestResult(test_name, task_name, result.TestStatuses.SUCCESS)
-        else:
-            return result.TestResult(test_name, task_name, result.TestStatuses.FAIL)
+        if expected_out.what in scanner.found:
+            return result.TestResult(test_name, producing_task_name=task_name, status=result.TestStatuses.SUCCESS)
+        return result.TestResult(test_name, producing_task_name=task_name, status=result.TestStatuses.FAIL, msg=msg, exception=exception)
 
 class UnexpectedOutput:
     """
@@ -103,26 +428,38 @@ class UnexpectedOutput:
     """
     def __init__(self, what: str, where: str | dependency.Dependency, cli=False) -> None:
         self.what = what
+        self._what_bytes = what.encode()  # Container logs come to us as bytes; no need to decode them just to search them
         self.where = where
         self.cli = cli  # is 'where' the CLI container? It gets treated differently than all the others
         self.pid = None  # Needs to be filled in by whoever launches the DUT(s)
+        self._cached_where = None  # See evaluated_where()
+        self._cached_where_args_id = None
 
     def evaluated_where(self, args) -> str:
         """
         Returns our `where`, after evaluating it if it is a dependency.
+
+        The result is computed once and reused for as long as we are given the same `args`.
         """
-        if issubclass(type(self.where), dependency.Dependency):
+        if self._cached_where is not None and self._cached_where_args_id == id(args):
+            return self._cached_where
+
+        if isinstance(self.where, dependency.Dependency):
             where = self.where.evaluate(args).item
         else:
             where = self.where
+        self._cached_where = where
+        self._cached_where_args_id = id(args)
         return where
 
-    def check_in_logs(self, args, logs: str, test_name: str, task_name: str) -> result.TestResult:
+    def check_in_logs(self, args, logs: bytes|str, test_name: str, task_name: str) -> result.TestResult:
         """
         Check that the unexpected text is NOT in the logs. If it is found, the test fails.
+        The logs may be given as the raw bytes we got from Docker; there's no need to decode them first.
         """
         common.info(f"Checking {test_name}'s logs to ensure '{self.what}' is NOT present...")
-        if self.what in logs:
+        what = self._what_bytes if isinstance(logs, (bytes, bytearray)) else self.what
+        if what in logs:
             return result.TestResult(test_name, task_name, result.TestStatuses.FAIL, msg=f"Found unexpected output '{self.what}' in logs")
         else:
             return result.TestResult(test_name, task_name, result.TestStatuses.SUCCESS)
@@ -140,7 +477,7 @@ class HWTest:
         self.expected_results = expected_results
 
 class CLITest:
-    def __init__(self, test_name: str, cli_image: str, cmd_to_run_in_cli: str=None, expected_outputs: List[ExpectedOutput]=None, need_to_access_cluster=False, network=None, setup_cmds: List[str]=None, teardown_cmds: List[str]=None, unexpected_outputs: List[UnexpectedOutput]=None, parallel_cmds: List[ParallelCommand]=None, environment: Dict[str, str]=None) -> None:
+    def __init__(self, test_name: str, cli_image: str, cmd_to_run_in_cli: str=None, expected_outputs: List[ExpectedOutput]=None, need_to_access_cluster=False, network=None, setup_cmds: List[str]=None, teardown_cmds: List[str]=None, unexpected_outputs: List[UnexpectedOutput]=None, parallel_cmds: List[ParallelCommand]=None, environment: Dict[str, str]=None, parallel_group: str=None, parallel_setup=False, parallel_teardown=False) -> None:
         self.test_name = test_name
         self.cli_image = cli_image
         self.cmd_to_run_in_cli = cmd_to_run_in_cli
@@ -152,8 +489,15 @@ class CLITest:
         self.network = network
         self.setup_cmds = setup_cmds or []
         self.teardown_cmds = teardown_cmds or []
+        self.parallel_setup = parallel_setup  # Are the setup commands independent of each other, so that they can all be run at once?
+        self.parallel_teardown = parallel_teardown  # Same, but for the teardown commands
         self.environment = environment or {}
-        self._stop_event = False
+        self.parallel_group = parallel_group  # Consecutive tests in the same group are run at the same time; see TestJob._run_steps()
+        self._stop_event = threading.Event()  # Exposed as a plain boolean through the stop_event property
+        self._cli_container = None  # Long-lived CLI container that we exec each command in; started on first use
+        self._cli_container_lock = threading.Lock()
+        self._cached_docker_context = None  # (CLI image, Docker kwargs); see _docker_context()
+        self._cached_docker_context_args_id = None
         # Validate that we have either cmd_to_run_in_cli OR parallel_cmds, but not both
         if cmd_to_run_in_cli and parallel_cmds:
             raise ValueError(f"Test {test_name} cannot have both 'cmd-to-run-in-cli' and 'parallel-cmds'")
@@ -161,21 +505,30 @@ class CLITest:
             raise ValueError(f"Test {test_name} must have either 'cmd-to-run-in-cli' or 'parallel-cmds'")
 
     @property
-    def stop_event(self):
-        return self._stop_event
+    def stop_event(self) -> bool:
+        return self._stop_event.is_set()
 
     @stop_event.setter
     def stop_event(self, value: bool):
         common.info(f"Setting stop_event for CLI test {self.test_name} to {value}")
-        self._stop_event = value
+        if value:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
 
     def __call__(self, args) -> result.TestResult:
+        try:
+            return self._run_test(args)
+        finally:
+            self._stop_cli_container()
+
+    def _run_test(self, args) -> result.TestResult:
         # Run setup commands
         try:
             self._run_setup_cmds(args)
         except Exception as e:
             common.error(f"Setup command failed for test {self.test_name}: {e}")
-            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=TestStatuses.FAIL, exception=e)
+            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=result.TestStatuses.FAIL, exception=e)
 
         try:
             # Launch the CLI command
@@ -192,7 +545,6 @@ class CLITest:
             # Check the DUT(s) output(s)
             common.debug(f"Checking DUT(s) for expected outputs for test {self.test_name}...")
             results = self._check_duts(args)
-            results = [r for r in results if r is not None and r.status != result.TestStatuses.SUCCESS]
 
             # If we got more than one result, let's log the various problems and just return the first failing one
             if len(results) > 1:
@@ -212,16 +564,16 @@ class CLITest:
                 self._run_teardown_cmds(args)
             except Exception as e:
                 common.error(f"Teardown command failed for test {self.test_name} after successful DUT check: {e}")
-                return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=TestStatuses.FAIL, exception=e)
+                return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=result.TestStatuses.FAIL, exception=e)
 
-            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=TestStatuses.SUCCESS)
+            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=result.TestStatuses.SUCCESS)
         except Exception as e:
             common.error(f"Exception while running test {self.test_name}: {e}")
             try:
                 self._run_teardown_cmds(args)
             except Exception as e:
                 common.error(f"Teardown command failed for test {self.test_name} after exception: {e}")
-            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=TestStatuses.FAIL, exception=e)
+            return result.TestResult(self.test_name, producing_task_name=self.producing_task_name, status=result.TestStatuses.FAIL, exception=e)
 
     def _kill_child_threads(self):
         """
@@ -234,26 +586,111 @@ class CLITest:
         Link each of this test's ExpectedOutput objects to its actual pid.
         """
         for e in self.expected_outputs:
+            if e.cli:
+                # Already known to be the CLI container, which doesn't have a PID until we run the CLI command.
+                continue
+
             where = e.evaluated_where(args)
             if where in pids:
-                e.pid = pids[e.evaluated_where(args)]
+                e.pid = pids[where]
             elif where == "artie-cli":
                 # We don't have a PID for the CLI container yet. We'll handle that later when we run the CLI command.
                 e.cli = True
             else:
                 raise KeyError(f"Cannot find a Docker ID corresponding to a Docker container that is expected to be running in this test. Offending container: {where}; available PIDs: {pids}")
 
+    def _docker_context(self, args) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns the evaluated CLI image and the kwargs to pass to Docker when running it.
+
+        These are computed once and reused for as long as we are given the same `args`.
+        """
+        if self._cached_docker_context is not None and self._cached_docker_context_args_id == id(args):
+            return self._cached_docker_context
+
+        cli_img = self._evaluated_cli_image(args)
+        kwargs = {'network_mode': 'host'} if self.network is None else {'network': self.network}
+
+        # Add environment variables
+        if self.environment:
+            kwargs['environment'] = self.environment
+
+        # Add kubeconfig if we need it
+        if self.need_to_access_cluster:
+            bind = {'bind': '/mnt/kube_config', 'mode': 'ro'}
+            kube_config_dpath = os.path.dirname(args.kube_config)
+            kwargs['volumes'] = {kube_config_dpath: bind}
+
+        self._cached_docker_context = (cli_img, kwargs)
+        self._cached_docker_context_args_id = id(args)
+        return self._cached_docker_context
+
     def _evaluated_cli_image(self, args) -> str:
         """
         Returns self.cli_image after evaluating it if it is a Dependency.
+
+        Tests that share a CLI image share a single evaluation of it (see `_evaluate_cli_image_once()`).
+        """
+        if isinstance(self.cli_image, dependency.Dependency):
+            key = (self.cli_image.producing_task_name, self.cli_image.artifact_name, self.cli_image.matchexpr, id(args))
+        else:
+            key = (self.cli_image, id(args))
+        return _evaluate_cli_image_once(key, lambda: self._evaluate_cli_image(args))
+
+    def _evaluate_cli_image(self, args) -> str:
+        """
+        Does the actual work of evaluating self.cli_image. Use `_evaluated_cli_image()` instead of this.
         """
-        if issubclass(type(self.cli_image), dependency.Dependency):
+        if isinstance(self.cli_image, dependency.Dependency):
             cli_img = self.cli_image.evaluate(args).item
         else:
             platform = common.host_platform()
             cli_img = str(docker.construct_docker_image_name(args, self.cli_image, platform))
         return cli_img
 
+    def _ensure_cli_container(self, args, check_alive=False):
+        """
+        Return this test's long-lived CLI container, starting it if we haven't yet.
+
+        If `check_alive` is given, we also make sure the container is still running and replace it if it isn't.
+        """
+        with self._cli_container_lock:
+            if self._cli_container is not None and check_alive:
+                try:
+                    self._cli_container.reload()
+                    alive = self._cli_container.status.lower() == "running"
+                except docker.docker_errors.NotFound:
+                    alive = False
+
+                if not alive:
+                    common.warning(f"CLI container for test {self.test_name} is no longer running. Starting a new one.")
+                    self._cli_container = None
+
+            if self._cli_container is None:
+                cli_img, kwargs = self._docker_context(args)
+
+                common.info(f"Starting CLI container for test {self.test_name}...")
+                self._cli_container = docker.start_docker_container(cli_img, "sleep infinity", **kwargs)
+
+            return self._cli_container
+
+    def _stop_cli_container(self):
+        """
+        Get rid of this test's long-lived CLI container if we started one.
+        """
+        with self._cli_container_lock:
+            if self._cli_container is None:
+                return
+
+            common.info(f"Stopping CLI container {self._cli_container.id} for test {self.test_name}...")
+            try:
+                # The container is only running 'sleep', which won't respond to SIGTERM, so don't bother with a graceful stop.
+                # The container gets removed automatically once it dies.
+                self._cli_container.kill()
+            except docker.docker_errors.APIError as e:
+                common.debug(f"Could not kill CLI container {self._cli_container.id}. It may have already stopped on its own, which is fine: {e}")
+            self._cli_container = None
+
     def _find_expected_cli_out(self, args) -> ExpectedOutput|None:
         """
         Attempt to find the CLI output from the ExpectedOutputs and return it.
@@ -283,10 +720,13 @@ class CLITest:
 
         Return None if success or a failing TestResult otherwise.
         """
-        logs = self._try_ntimes(args, 5, self.cmd_to_run_in_cli)
+        # If all we care about is whether some output shows up, we can stop waiting on the command as soon as it does
+        expected_cli_out = self._find_expected_cli_out(args)
+        expected = [expected_cli_out.what] if expected_cli_out is not None else []
+        scanner = OutputScanner(expected, [u.what for u in self.unexpected_outputs if u.cli])
+        logs = self._try_ntimes(args, 5, self.cmd_to_run_in_cli, scanner=scanner)
 
         # Check expected outputs
-        expected_cli_out = self._find_expected_cli_out(args)
         if expected_cli_out is not None:
             common.info(f"Checking CLI output for expected output '{expected_cli_out.what}'...")
             res = expected_cli_out.check_in_logs(args, logs, self.test_name, self.producing_task_name)
@@ -309,98 +749,163 @@ class CLITest:
         """
         common.info(f"Running {len(self.parallel_cmds)} parallel commands for test {self.test_name}...")
 
-        # Storage for results from each thread
-        results = {}
-        exceptions = {}
+        # Set as soon as any command fails, so the others can stop wasting time
+        cancel = threading.Event()
 
-        def run_cmd_thread(idx: int, parallel_cmd: ParallelCommand):
-            """Run a single command in a thread and store its output."""
+        def run_cmd(idx: int, parallel_cmd: ParallelCommand) -> result.TestResult|None:
+            """Run a single command and check its output. Returns None if it passed or was cancelled."""
+            if cancel.is_set():
+                return None
+
+            common.info(f"Running parallel command {idx+1}/{len(self.parallel_cmds)}: {parallel_cmd.cmd}")
+            # The command's expected and unexpected outputs are all looked for in a single pass over its output
+            scanner = parallel_cmd.scanner
             try:
-                common.info(f"Running parallel command {idx+1}/{len(self.parallel_cmds)}: {parallel_cmd.cmd}")
-                logs = self._try_ntimes(args, 5, parallel_cmd.cmd)
-                results[idx] = logs
-                common.debug(f"Finished parallel command {idx+1}/{len(self.parallel_cmds)}. Results collected: {logs[:1000]}...")
+                logs = self._try_ntimes(args, 5, parallel_cmd.cmd, scanner=scanner, cancel=cancel)
             except Exception as e:
-                exceptions[idx] = e
-
-        # Start all commands in parallel
-        threads = []
-        for idx, parallel_cmd in enumerate(self.parallel_cmds):
-            common.debug(f"Starting thread for parallel command {idx+1}/{len(self.parallel_cmds)}...")
-            thread = threading.Thread(target=run_cmd_thread, args=(idx, parallel_cmd))
-            thread.start()
-            threads.append(thread)
-
-        # Wait for all threads to complete
-        for thread in threads:
-            common.debug(f"Waiting for thread {thread.name} to finish...")
-            thread.join()
-
-        # Check if any thread had an exception
-        if exceptions:
-            first_exception = exceptions[min(exceptions.keys())]
-            return result.TestResult(self.test_name, self.producing_task_name, result.TestStatuses.FAIL, exception=first_exception)
-
-        # Check expected outputs for each parallel command
-        for idx, parallel_cmd in enumerate(self.parallel_cmds):
-            logs = results[idx]
-
-            # Check expected outputs
+                if cancel.is_set():
+                    return None
+                self._cancel_parallel_cmds(cancel)
+                return result.TestResult(self.test_name, self.producing_task_name, result.TestStatuses.FAIL, exception=e)
+            common.debug(f"Finished parallel command {idx+1}/{len(self.parallel_cmds)}. Results collected: {logs[:1000].decode(errors='replace')}...")
+
+            # Output from a command that got cut short by somebody else's failure doesn't tell us anything
+            if cancel.is_set():
+                return None
+
+            # Check expected outputs (the scanner has already looked for all of them while the output streamed in)
             for expected_out in parallel_cmd.expected_outputs:
-                if expected_out.what not in logs:
+                if expected_out.what not in scanner.found:
                     common.debug(f"Expected output '{expected_out.what}' not found in parallel command {idx+1}")
+                    self._cancel_parallel_cmds(cancel)
                     return result.TestResult(self.test_name, self.producing_task_name, result.TestStatuses.FAIL, msg=f"Expected output '{expected_out.what}' not found in parallel command {idx+1}")
 
             # Check unexpected outputs
             for unexpected_out in parallel_cmd.unexpected_outputs:
-                if unexpected_out.what in logs:
+                if unexpected_out.what in scanner.found:
                     common.debug(f"Unexpected output '{unexpected_out.what}' found in parallel command {idx+1}")
+                    self._cancel_parallel_cmds(cancel)
                     return result.TestResult(self.test_name, self.producing_task_name, result.TestStatuses.FAIL, msg=f"Unexpected output '{unexpected_out.what}' found in parallel command {idx+1}")
 
+            return None
+
+        # Every command gets its own thread, rather than waiting its turn on the shared pool: some sets of commands
+        # (a publisher and its subscribers, say) only work if they are all running at once. So we wait until there are
+        # slots for all of them, rather than starting some of them and leaving the rest to wait on everybody else.
+        failures = {}
+        nslots = _acquire_docker_cmd_slots(len(self.parallel_cmds))
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.parallel_cmds), thread_name_prefix=f"{self.test_name}-parallel-cmd") as executor:
+                futures = {executor.submit(run_cmd, idx, parallel_cmd): idx for idx, parallel_cmd in enumerate(self.parallel_cmds)}
+                for future in concurrent.futures.as_completed(futures):
+                    res = future.result()
+                    if res is not None:
+                        failures[futures[future]] = res
+        finally:
+            _release_docker_cmd_slots(nslots)
+
+        if failures:
+            return failures[min(failures.keys())]
+
         return result.TestResult(self.test_name, self.producing_task_name, result.TestStatuses.SUCCESS)
 
-    def _try_ntimes(self, args, n: int, cmd: str):
+    def _cancel_parallel_cmds(self, cancel: threading.Event):
         """
-        Try running the CLI command up to `n` times to guard against transient timing errors. Yuck.
+        Tell all the other parallel commands to give up, and kill the CLI container so that
+        any commands that are still in flight die right now instead of running out their timeouts.
         """
-        cli_img = self._evaluated_cli_image(args)
-        kwargs = {'network_mode': 'host'} if self.network is None else {'network': self.network}
+        if not cancel.is_set():
+            cancel.set()
+            self._stop_cli_container()
 
-        # Add environment variables
-        if self.environment:
-            kwargs['environment'] = self.environment
+    def _try_ntimes(self, args, n: int, cmd: str, scanner: OutputScanner=None, cancel: threading.Event=None):
+        """
+        Try running the CLI command up to `n` times to guard against transient timing errors. Yuck.
+        Errors that won't go away by trying again (see `_NON_TRANSIENT_CLI_ERRORS`) are raised right away.
 
-        # Add kubeconfig if we need it
-        if self.need_to_access_cluster:
-            bind = {'bind': '/mnt/kube_config', 'mode': 'ro'}
-            kube_config_dpath = os.path.dirname(args.kube_config)
-            kwargs['volumes'] = {kube_config_dpath: bind}
+        Each attempt is executed inside this test's long-lived CLI container, so we don't pay for container startup every time.
 
+        If `scanner` is given, it is fed the command's output as it streams in, and we return as soon as
+        it says we can, rather than waiting for the command to finish. It is reset before each attempt.
+
+        If `cancel` is given and gets set, we treat it the same as being told to stop.
+        """
+        delay_s = 0.25
         for i in range(n):
             try:
-                logs = docker.run_docker_container(cli_img, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, **kwargs)
-                return logs
+                if cancel is not None and cancel.is_set():
+                    # Don't (re)start the CLI container just to run a command nobody wants anymore
+                    raise RuntimeError(f"Command '{cmd}' was cancelled before it could run.")
+
+                cli_container = self._ensure_cli_container(args, check_alive=(i > 0))
+                if scanner is not None:
+                    scanner.reset()
+                stop_when = scanner.feed if scanner is not None else None
+                return docker.exec_in_docker_container(cli_container, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, stop_when=stop_when, decode=False)
             except Exception as e:
-                if i != n - 1 and not self.stop_event:
-                    common.warning(f"Got an exception while trying to run CLI. Will try {n - (i+1)} more times. Exception: {e}")
-                    time.sleep(1)
-                elif self.stop_event:
+                if self._stop_event.is_set() or (cancel is not None and cancel.is_set()):
                     common.warning(f"Got an exception while trying to run CLI. Would normally try {n - (i+1)} more times, but this test has been told to stop. Exception: {e}")
-                    raise e
-                else:
-                    raise e
+                    raise
+                elif i == n - 1:
+                    raise
+                elif isinstance(e, _NON_TRANSIENT_CLI_ERRORS):
+                    common.warning(f"Got an exception while trying to run CLI that trying again won't fix. Giving up. Exception: {e}")
+                    raise
+
+                common.warning(f"Got an exception while trying to run CLI. Will try {n - (i+1)} more times. Exception: {e}")
+                if self._wait_for_stop(delay_s, cancel):
+                    # Told to stop (or cancelled) while we were backing off; don't bother with another attempt
+                    raise
+                delay_s = min(delay_s * 2, 4.0)
+
+    def _wait_for_stop(self, timeout_s: float, cancel: threading.Event=None) -> bool:
+        """
+        Wait up to `timeout_s` seconds, returning True as soon as we are told to stop or `cancel` (if given) gets set,
+        or False if neither happened in time. There's no waiting on two events at once, so we wait on them in short slices.
+        """
+        deadline = time.monotonic() + timeout_s
+        while True:
+            if cancel is not None and cancel.is_set():
+                return True
+            remaining_s = deadline - time.monotonic()
+            if remaining_s <= 0:
+                return False
+            if self._stop_event.wait(min(remaining_s, _STOP_POLL_INTERVAL_S)):
+                return True
 
     def _check_duts(self, args) -> List[result.TestResult]:
         """
-        Runs _check_dut() on each DUT pid, managing the total test timeout appropriately.
+        Runs check() on each expected output concurrently, so that they all share the same test timeout,
+        rather than waiting on each one in turn.
+
+        Returns only the failing results, in the same order as the expected outputs.
         """
+        # The CLI's output gets checked when we run the CLI command, so there's nothing to wait on for those.
+        # Everything we're looking for in the same DUT gets looked for in a single read of its logs.
+        by_pid: Dict[str, List[ExpectedOutput]] = {}
+        for expected_out in self.expected_outputs:
+            if not expected_out.cli:
+                by_pid.setdefault(expected_out.pid, []).append(expected_out)
+        if not by_pid:
+            return []
+
         timeout_s = args.test_timeout_s
+        results_by_output = {}
+        if len(by_pid) == 1:
+            # Most tests only look at one DUT, in which case there's nothing to run concurrently with
+            (pid, outs), = by_pid.items()
+            results_by_output.update(zip(map(id, outs), MultiPatternChecker(pid, outs).check(args, self.test_name, self.producing_task_name, timeout_s)))
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(by_pid), thread_name_prefix=f"{self.test_name}-check-dut") as executor:
+                futures = {pid: executor.submit(MultiPatternChecker(pid, outs).check, args, self.test_name, self.producing_task_name, timeout_s) for pid, outs in by_pid.items()}
+                for pid, f in futures.items():
+                    results_by_output.update(zip(map(id, by_pid[pid]), f.result()))
+
         results = []
         for expected_out in self.expected_outputs:
-            r = expected_out.check(args, self.test_name, self.producing_task_name, timeout_s)
-            if r is not None and r.exception is not None and type(r.exception) == TimeoutError:
-                timeout_s = 1  # Give us a chance to collect the rest of the results
-            results.append(r)
+            r = results_by_output.get(id(expected_out))
+            if r is not None and r.status != result.TestStatuses.SUCCESS:
+                results.append(r)
         return results
 
     def _run_setup_cmds(self, args):
@@ -411,22 +916,25 @@ class CLITest:
             return
 
         common.info(f"Running {len(self.setup_cmds)} setup command(s) for test {self.test_name}...")
-        cli_img = self._evaluated_cli_image(args)
-        kwargs = {'network_mode': 'host'} if self.network is None else {'network': self.network}
-
-        # Add environment variables
-        if self.environment:
-            kwargs['environment'] = self.environment
-
-        # Add kubeconfig if we need it
-        if self.need_to_access_cluster:
-            bind = {'bind': '/mnt/kube_config', 'mode': 'ro'}
-            kube_config_dpath = os.path.dirname(args.kube_config)
-            kwargs['volumes'] = {kube_config_dpath: bind}
+        cli_container = self._ensure_cli_container(args)
+
+        if self.parallel_setup and len(self.setup_cmds) > 1:
+            futures = [_submit_docker_cmd(self._run_setup_cmd, args, cli_container, i, cmd) for i, cmd in enumerate(self.setup_cmds)]
+            concurrent.futures.wait(futures)
+            for f in futures:
+                if f.exception() is not None:
+                    raise f.exception()
+            return
 
         for i, cmd in enumerate(self.setup_cmds):
-            common.info(f"Running setup command {i+1}/{len(self.setup_cmds)}: {cmd}")
-            docker.run_docker_container(cli_img, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, **kwargs)
+            self._run_setup_cmd(args, cli_container, i, cmd)
+
+    def _run_setup_cmd(self, args, cli_container, i: int, cmd: str):
+        """
+        Run the `i`th setup command in the given CLI container.
+        """
+        common.info(f"Running setup command {i+1}/{len(self.setup_cmds)}: {cmd}")
+        docker.exec_in_docker_container(cli_container, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, decode=False)
 
     def _run_teardown_cmds(self, args):
         """
@@ -436,25 +944,39 @@ class CLITest:
             return
 
         common.info(f"Running {len(self.teardown_cmds)} teardown command(s) for test {self.test_name}...")
-        cli_img = self._evaluated_cli_image(args)
-        kwargs = {'network_mode': 'host'} if self.network is None else {'network': self.network}
-
-        # Add environment variables
-        if self.environment:
-            kwargs['environment'] = self.environment
+        try:
+            cli_container = self._ensure_cli_container(args, check_alive=True)
+        except Exception as e:
+            # If we can't even get a CLI container up, every one of the teardown commands would fail the same way
+            common.warning(f"Could not get a CLI container to run teardown commands in. Skipping all {len(self.teardown_cmds)} of them: {e}")
+            return
 
-        # Add kubeconfig if we need it
-        if self.need_to_access_cluster:
-            bind = {'bind': '/mnt/kube_config', 'mode': 'ro'}
-            kube_config_dpath = os.path.dirname(args.kube_config)
-            kwargs['volumes'] = {kube_config_dpath: bind}
+        if self.parallel_teardown and len(self.teardown_cmds) > 1:
+            # Every teardown command gets its chance, no matter how many of the others fail
+            futures = [_submit_docker_cmd(self._run_teardown_cmd, args, cli_container, i, cmd) for i, cmd in enumerate(self.teardown_cmds)]
+            for i, f in enumerate(futures):
+                if f.exception() is not None:
+                    common.warning(f"Teardown command {i+1} failed (continuing anyway): {f.exception()}")
+            return
 
         for i, cmd in enumerate(self.teardown_cmds):
-            common.info(f"Running teardown command {i+1}/{len(self.teardown_cmds)}: {cmd}")
             try:
-                docker.run_docker_container(cli_img, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, **kwargs)
+                self._run_teardown_cmd(args, cli_container, i, cmd)
             except Exception as e:
                 common.warning(f"Teardown command {i+1} failed (continuing anyway): {e}")
+                # The failure may have been because the container died; make sure we have a live one for the next command
+                try:
+                    cli_container = self._ensure_cli_container(args, check_alive=True)
+                except Exception as e:
+                    common.warning(f"Could not get a CLI container to run the remaining teardown commands in. Skipping them: {e}")
+                    return
+
+    def _run_teardown_cmd(self, args, cli_container, i: int, cmd: str):
+        """
+        Run the `i`th teardown command in the given CLI container.
+        """
+        common.info(f"Running teardown command {i+1}/{len(self.teardown_cmds)}: {cmd}")
+        docker.exec_in_docker_container(cli_container, cmd, timeout_s=args.test_timeout_s, log_to_stdout=args.docker_logs, decode=False)
 
 class TestJob(job.Job):
     """
@@ -478,7 +1000,7 @@ class TestJob(job.Job):
             self.setup(args)
         except Exception as e:
             common.error(f"Exception during setup of test job {self.name}: {e}")
-            results += [result.TestResult("Exception during setup", self.parent_task.name, TestStatuses.FAIL, exception=e)]
+            results += [result.TestResult("Exception during setup", self.parent_task.name, result.TestStatuses.FAIL, exception=e)]
             failed = True
 
         # Try to run the steps, but only if setup didn't fail.
@@ -487,21 +1009,20 @@ class TestJob(job.Job):
                 results += self._run_steps(args)
             except Exception as e:
                 common.error(f"Exception while running test job {self.name}: {e}")
-                results += [result.TestResult("Exception in test job", self.parent_task.name, TestStatuses.FAIL, exception=e)]
+                results += [result.TestResult("Exception in test job", self.parent_task.name, result.TestStatuses.FAIL, exception=e)]
 
         # Try to run teardowns, regardless of what has happened so far.
         try:
             self.teardown(args, results)
         except Exception as e:
             common.error(f"Exception during teardown of test job {self.name}: {e}")
-            results += [result.TestResult("Exception during teardown", self.parent_task.name, TestStatuses.FAIL, exception=e)]
+            results += [result.TestResult("Exception during teardown", self.parent_task.name, result.TestStatuses.FAIL, exception=e)]
+        finally:
+            # Stop following the logs of any containers our tests were checking
+            ContainerLogTap.close_all()
 
         # Check success
-        success = True
-        for r in results:
-            if r.status.value == TestStatuses.FAIL.value:
-                success = False
-                break
+        success = not any(r.status is result.TestStatuses.FAIL for r in results)
 
         self.mark_all_artifacts_as_built()
         return result.JobResult(self.name, success=success, artifacts=results)
@@ -509,48 +1030,93 @@ class TestJob(job.Job):
     def _run_steps(self, args) -> List[result.TestResult]:
         """
         Run each test in this job and return the list of results.
+
+        Consecutive tests that share a `parallel_group` are run at the same time; all others are run one after another.
         """
+        # None of these change while the tests run, so look them up once
+        steps = self.steps
+        n_steps = len(steps)
+        fail_fast = args.fail_fast
+        force_completion = args.force_completion
+
         results = []
-        for i, t in enumerate(self.steps):
-            common.info(f"::::::::::: Running test {i+1}/{len(self.steps)}: {t.test_name} :::::::::::")
-            try:
-                test_result = common.manage_timeout(t, args.test_timeout_s, args)
-                results.append(test_result)
-                common.info(f"Finished test: {t.test_name} with result: {test_result.status.name}")
-                if test_result.status != TestStatuses.SUCCESS and args.fail_fast:
-                    common.info(f"--fail-fast enabled and test {t.test_name} failed. Marking rest of this task's tests as DID_NOT_RUN.")
-                    results = self._mark_remaining_tests_as_did_not_run(results, i)
-                    break
-            except Exception as e:
-                common.error(f"Exception while running test {t.test_name}: {e}")
-
-                # At this point, we may have child threads from test steps that are managing
-                # timeouts themselves. We need to kill those threads to prevent them from continuing to run and potentially
-                # interfering with future tests.
-                if hasattr(t, "kill_child_threads"):
-                    common.info(f"Killing child threads of test {t.test_name} to prevent interference with future tests...")
-                    t._kill_child_threads()
-
-                # Log exception if --enable-error-tracing
-                if args.enable_error_tracing:
-                    common.error(f"Error running test {t.test_name}: {''.join(traceback.format_exception(e))}")
-                else:
-                    common.error(f"Test {t.test_name} failed due to an exception ({e})")
+        i = 0
+        while i < n_steps:
+            group = self._step_group_starting_at(i)
+            if len(group) == 1:
+                group_results = [self._run_step(args, i, group[0])]
+            else:
+                common.info(f"Running tests {i+1}-{i+len(group)}/{n_steps} at the same time (parallel group '{group[0].parallel_group}')...")
+                with concurrent.futures.ThreadPoolExecutor(max_workers=len(group), thread_name_prefix=f"{self.name}-parallel-group") as executor:
+                    futures = [executor.submit(self._run_step, args, i + j, t) for j, t in enumerate(group)]
+                    group_results = [f.result() for f in futures]
 
-                # Add this result
-                results.append(result.TestResult(t.test_name, producing_task_name=self.parent_task.name, status=TestStatuses.FAIL, exception=e))
+            results += [test_result for test_result, _ in group_results]
+            last = i + len(group) - 1
+            raised = any(exception_raised for _, exception_raised in group_results)
+            failed = any(test_result.status is not result.TestStatuses.SUCCESS for test_result, _ in group_results)
 
+            if raised:
                 # Mark all remaining tests as DID_NOT_RUN if user is not using --force-completion
-                if args.force_completion:
+                if force_completion:
                     common.info("--force-completion argument detected. Running rest of tests in this task.")
-                elif i + 1 < len(self.steps):
+                elif last + 1 < n_steps:
                     common.info("Marking rest of this task's tests as DID_NOT_RUN. Use --force-completion flag to change this behavior.")
-                    results = self._mark_remaining_tests_as_did_not_run(results, i)
+                    results = self._mark_remaining_tests_as_did_not_run(results, last)
                     return results
                 else:
-                    common.debug(f"Finished test {t.test_name} with an exception, but there are no more tests to run in this task, so we're not marking any additional tests as DID_NOT_RUN.")
+                    common.debug(f"Finished test {steps[last].test_name} with an exception, but there are no more tests to run in this task, so we're not marking any additional tests as DID_NOT_RUN.")
+            elif failed and fail_fast:
+                common.info(f"--fail-fast enabled and a test failed. Marking rest of this task's tests as DID_NOT_RUN.")
+                results = self._mark_remaining_tests_as_did_not_run(results, last)
+                break
+
+            i = last + 1
         return results
 
+    def _step_group_starting_at(self, index: int) -> List[callable]:
+        """
+        Return the run of consecutive steps starting at `index` that are in the same parallel group
+        (or just the one step, if it isn't in a parallel group).
+        """
+        group_name = getattr(self.steps[index], 'parallel_group', None)
+        if group_name is None:
+            return [self.steps[index]]
+
+        end = index + 1
+        while end < len(self.steps) and getattr(self.steps[end], 'parallel_group', None) == group_name:
+            end += 1
+        return self.steps[index:end]
+
+    def _run_step(self, args, i: int, t) -> Tuple[result.TestResult, bool]:
+        """
+        Run a single test and return its result, along with whether it raised an exception.
+        """
+        common.info(f"::::::::::: Running test {i+1}/{len(self.steps)}: {t.test_name} :::::::::::")
+        try:
+            test_result = common.manage_timeout(t, args.test_timeout_s, args)
+            common.info(f"Finished test: {t.test_name} with result: {test_result.status.name}")
+            return test_result, False
+        except Exception as e:
+            common.error(f"Exception while running test {t.test_name}: {e}")
+
+            # At this point, we may have child threads from test steps that are managing
+            # timeouts themselves. We need to kill those threads to prevent them from continuing to run and potentially
+            # interfering with future tests.
+            if hasattr(t, "kill_child_threads"):
+                common.info(f"Killing child threads of test {t.test_name} to prevent interference with future tests...")
+                t._kill_child_threads()
+
+            # Log exception if --enable-error-tracing
+            if args.enable_error_tracing:
+                # The first few frames are where the useful information is; don't pay to format arbitrarily deep stacks
+                tb = traceback.TracebackException.from_exception(e, limit=_MAX_TRACEBACK_FRAMES)
+                common.error(f"Error running test {t.test_name}: {''.join(tb.format())}")
+            else:
+                common.error(f"Test {t.test_name} failed due to an exception ({e})")
+
+            return result.TestResult(t.test_name, producing_task_name=self.parent_task.name, status=result.TestStatuses.FAIL, exception=e), True
+
     def link(self, parent, index: int):
         super().link(parent, index)
         for s in self.steps:
@@ -569,10 +1135,20 @@ class TestJob(job.Job):
         """
         pass
 
+    def _start_log_taps(self, containers: List[Any]):
+        """
+        Start following the logs of whichever of the given DUT containers our tests are going to check,
+        so that their output is already being read in the background (as it is produced) by the time a test looks at it.
+        """
+        checked_pids = {e.pid for step in self.steps for e in getattr(step, 'expected_outputs', []) if not e.cli and e.pid is not None}
+        for container in containers:
+            if container.id in checked_pids or container.short_id in checked_pids:
+                ContainerLogTap.get_or_create(container)
+
     def _mark_remaining_tests_as_did_not_run(self, results: List[result.TestResult], current_index: int) -> list[result.TestResult]:
         """
         Mark all tests after the current_index in results as DID_NOT_RUN.
         """
-        for remaining_test in self.steps[current_index+1:]:
-            results.append(result.TestResult(remaining_test.test_name, producing_task_name=self.parent_task.name, status=TestStatuses.DID_NOT_RUN))
+        task_name = self.parent_task.name
+        results.extend(result.TestResult(remaining_test.test_name, producing_task_name=task_name, status=result.TestStatuses.DID_NOT_RUN) for remaining_test in self.steps[current_index+1:])
         return results
@@ -11,17 +11,70 @@ from . import common
 from artie_tooling import hw_config
 from artie_tooling import kubespec
 import argparse
+import concurrent.futures
 import io
 import dataclasses
 import enum
+import functools
+import hashlib
 import io
 import json
 import kubernetes as k8s
+import os
 import pathlib
+import random
+import re
 import subprocess
+import threading
+import time
 import urllib3
 import yaml
 
+# Use the libyaml-backed loader and dumper if PyYAML was built with them
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+
+# The most pods' logs we will fetch from the API server at once
+_MAX_CONCURRENT_LOG_FETCHES = 16
+
+# What a networking hiccup looks like in helm's output (as opposed to a real failure that will just happen again)
+_TRANSIENT_NETWORK_ERROR_PATTERN = re.compile(r"tcp|i/o timeout|\bEOF\b|connection refused|connection reset|temporary failure", re.IGNORECASE)
+
+# The longest (in seconds) we wait between attempts at a command that failed for networking reasons
+_MAX_RETRY_BACKOFF_S = 5.0
+
+# How many Helm charts we install at once (unless args.helm_concurrency says otherwise); see install_helm_charts()
+_DEFAULT_HELM_CONCURRENCY = 4
+
+# How long (in seconds) we trust what `helm list` told us about a namespace's releases
+_HELM_LIST_CACHE_TTL_S = 30
+
+# Where we remember which Chart.yaml/Chart.lock/local dependencies a chart's charts/ directory was last updated against
+_HELM_DEPS_MARKER_FILE = ".artietool-deps-sha256"
+
+# Chart directories whose dependencies we have already brought up to date during this run; see _update_helm_dependencies()
+_up_to_date_helm_charts = set()
+_up_to_date_helm_charts_lock = threading.Lock()
+
+# (kube config, namespace) -> (when we got an answer, {release name: status} or the error Helm gave us); see _helm_list()
+_helm_list_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, "HelmChartStatuses"]|OSError]] = {}
+_helm_list_cache_lock = threading.Lock()
+
+# Kind of namespaced resource (as we call it in log messages) -> (the API that owns it, its delete method); see _delete_namespaced()
+_DELETE_DISPATCH = {
+    "config map": (k8s.client.CoreV1Api, "delete_namespaced_config_map"),
+    "job": (k8s.client.BatchV1Api, "delete_namespaced_job"),
+    "pod": (k8s.client.CoreV1Api, "delete_namespaced_pod"),
+    "secret": (k8s.client.CoreV1Api, "delete_namespaced_secret"),
+}
+
+# How long (in seconds) we trust an Artie's hardware configuration once we've read it from the cluster
+_HW_CONFIG_CACHE_TTL_S = 5 * 60
+
+# (kube config, Artie name, namespace) -> (when we read it, the HW config); see get_artie_hw_config()
+_hw_config_cache: Dict[Tuple[str, str, str], Tuple[float, hw_config.HWConfig]] = {}
+_hw_config_cache_lock = threading.Lock()
+
 class HelmChartStatuses(enum.StrEnum):
     """
     Possible status values for a Helm Chart.
@@ -57,19 +110,55 @@ class HelmChart:
     # The chart reference, typically a path to one on the file system, but could be a URL.
     chart: str
 
+def _api_client(config_file: str|None) -> k8s.client.ApiClient:
+    """
+    Return the API client for the cluster in the given Kube config file. Every call we make to that cluster
+    shares this one client (and so its connections to the API server), rather than each setting up its own.
+
+    The config file is only read again if it has changed since we last loaded it.
+    """
+    fpath = os.path.expanduser(config_file if config_file is not None else k8s.config.KUBE_CONFIG_DEFAULT_LOCATION)
+    try:
+        mtime = os.stat(fpath).st_mtime_ns
+    except OSError:
+        mtime = None
+    return _load_api_client(config_file, mtime)
+
+@functools.lru_cache(maxsize=8)
+def _load_api_client(config_file: str|None, mtime: int|None) -> k8s.client.ApiClient:
+    """
+    Does the actual work of loading the Kube config file and creating a client from it. Use `_api_client()` instead of this.
+    """
+    return k8s.config.new_client_from_config(config_file=config_file)
+
 def _configure(args: argparse.Namespace, need_artie_name: bool = False):
     """
-    Load the Kube config from the environment. If `need_artie_name` is `True`, we
+    Load the Kube config from the environment (if we haven't already). If `need_artie_name` is `True`, we
     also configure `args` with 'artie_name` based on the only Artie we find in the cluster.
     If no 'artie_name' is given, `need_artie_name` is `True`, and there is more than one or less
     than one Artie on the cluster, we raise a ValueError (for zero Arties) or a KeyError (for more than one Artie).
     """
-    config_file = args.kube_config
-    k8s.config.load_kube_config(config_file=config_file)
+    # The config is only loaded (and parsed) the first time, or if it has changed; otherwise this is just a cache lookup
+    _api_client(args.kube_config)
 
     if need_artie_name:
         _determine_artie_name(args)
 
+def _delete_namespaced(args, kind: str, name: str, namespace, ignore_errors: bool):
+    """
+    Delete the given namespaced resource, where `kind` is one of the keys in `_DELETE_DISPATCH`.
+    """
+    namespace = str(namespace).lower()
+    _configure(args)
+    api, method = _DELETE_DISPATCH[kind]
+    try:
+        getattr(api(_api_client(args.kube_config)), method)(name, namespace, grace_period_seconds=0, propagation_policy='Foreground')
+    except Exception as e:
+        if not ignore_errors:
+            raise e
+        else:
+            common.warning(f"Error deleting {kind} {namespace}:{name}: {e}")
+
 def _determine_artie_name(args: argparse.Namespace) -> argparse.Namespace:
     """
     Determine what Artie name we want to use. If the user has not specified one and we can't
@@ -97,36 +186,135 @@ def _get_node_from_name(v1: k8s.client.CoreV1Api, name: str) -> k8s.client.V1Nod
     Retrieve the API node object that has the given name in the cluster.
     Raises ValueError if we can't find the node.
     """
-    node_list = v1.list_node().items
-    for node in node_list:
-        if node.metadata.name == name:
-                return node
-
-    raise ValueError(f"Cannot find node {name} in cluster.")
+    try:
+        return v1.read_node(name)
+    except k8s.client.exceptions.ApiException as e:
+        if e.status == 404:
+            raise ValueError(f"Cannot find node {name} in cluster.")
+        raise e
 
 def _handle_transient_network_errors(cmd: List[str], n=5):
     """
     Run the given `cmd` up to `n` times, returning (whether we succeeded or not, retcode, stderr, stdout).
+
+    We only try again if the failure looks like a networking hiccup, backing off a little more each time.
     """
-    n_retries = 3
-    i = 1
-    p = subprocess.run(cmd, capture_output=True, encoding='utf-8')
-    while i < n_retries and p.returncode !=0 and ('tcp' in p.stdout.lower() or 'tcp' in p.stderr.lower()):
-        common.warning(f"Networking error. Retrying.")
+    for attempt in range(n):
         p = subprocess.run(cmd, capture_output=True, encoding='utf-8')
-        i += 1
+        if p.returncode == 0 or attempt == n - 1 or not _TRANSIENT_NETWORK_ERROR_PATTERN.search(p.stderr + p.stdout):
+            break
+
+        common.warning(f"Networking error. Retrying.")
+        time.sleep(min(_MAX_RETRY_BACKOFF_S, 0.1 * 2**attempt + random.uniform(0, 0.05)))
     return p.returncode == 0, p.returncode, p.stderr, p.stdout
 
+def _job_status(job: k8s.client.V1Job) -> JobStatuses:
+    """
+    Work out the status of the given job from what the API server told us about it.
+    """
+    status = job.status
+    if status.active is not None and status.active > 0:
+        # At least one pod is still pending or running
+        return JobStatuses.INCOMPLETE
+    elif status.failed is not None and status.failed > 0:
+        # At least one pod failed
+        return JobStatuses.FAILED
+    elif status.succeeded is not None and status.succeeded > 0:
+        # No active or failed pods AND at least one pod is successful. Looks good.
+        return JobStatuses.SUCCEEDED
+    else:
+        # Can't understand this state. No active, failed, or succeeded pods.
+        return JobStatuses.UNKNOWN
+
+def _node_is_ready(node: k8s.client.V1Node) -> bool:
+    """
+    Returns True if the given node's status says it is Ready. False otherwise.
+    """
+    for c in node.status.conditions or []:
+        if c.type == "Ready":
+            return c.status == "True"
+    return False
+
+def _helm_list(args, namespace: str, fresh=False) -> Dict[str, HelmChartStatuses]:
+    """
+    Returns a dict of release name to status for every Helm release in the given namespace.
+
+    The result is reused for up to `_HELM_LIST_CACHE_TTL_S` seconds, or until we install or delete a release
+    in the namespace (see `_invalidate_helm_list()`), whichever comes first. Failures are remembered just the same
+    (and raised again), so that when the cluster is struggling, everyone polling it doesn't make matters worse.
+
+    If `fresh` is given, we ask Helm regardless (and cache what it tells us for everyone else).
+    """
+    key = (args.kube_config, namespace)
+    with _helm_list_cache_lock:
+        cached = _helm_list_cache.get(key)
+    if not fresh and cached is not None and time.monotonic() - cached[0] < _HELM_LIST_CACHE_TTL_S:
+        _, statuses = cached
+        if isinstance(statuses, OSError):
+            raise OSError(*statuses.args)
+        return statuses
+
+    cmd = ["helm", "list", "--kubeconfig", args.kube_config, "--namespace", namespace, "--output", "json"]
+    success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
+    if success and stdout.strip() in ("", "[]"):
+        # Nothing installed in this namespace, so nothing to parse
+        statuses = {}
+    elif success:
+        statuses = {o['name']: HelmChartStatuses(o['status']) for o in json.loads(stdout)}
+    else:
+        statuses = OSError(f"Helm failed: {stderr}; {stdout}")
+
+    # Time the entry from when we got the answer, not from when we asked, since Helm can take a while to give up
+    with _helm_list_cache_lock:
+        _helm_list_cache[key] = (time.monotonic(), statuses)
+
+    if isinstance(statuses, OSError):
+        raise OSError(*statuses.args)
+    return statuses
+
+def _invalidate_helm_list(args, namespace: str):
+    """
+    Forget what we know about the Helm releases in the given namespace, because we just changed them.
+    """
+    with _helm_list_cache_lock:
+        _helm_list_cache.pop((args.kube_config, namespace), None)
+
+def _helm_dependencies_hash(chart_path: pathlib.Path, chart_data: dict) -> str:
+    """
+    Hash everything that `helm dependency update` would give us a different answer for: the chart's Chart.yaml,
+    its Chart.lock (if it has one), and the contents of any dependencies that live on the local file system.
+    """
+    h = hashlib.sha256()
+    h.update((chart_path / "Chart.yaml").read_bytes())
+    if (chart_path / "Chart.lock").is_file():
+        h.update((chart_path / "Chart.lock").read_bytes())
+    for dep in chart_data['dependencies'] or []:
+        repo = str(dep.get('repository', ''))
+        if not repo.startswith("file://"):
+            continue
+        dep_path = (chart_path / repo[len("file://"):]).resolve()
+        for fpath in sorted(p for p in dep_path.rglob("*") if p.is_file()):
+            h.update(str(fpath.relative_to(dep_path)).encode())
+            h.update(fpath.read_bytes())
+    return h.hexdigest()
+
 def _update_helm_dependencies(args, chart: str):
     """
     Update Helm chart dependencies if the chart has any.
     Silently succeeds if there are no dependencies or if the chart doesn't exist.
+
+    Skips the update if nothing it depends on has changed since the last time we did it.
     """
     # Check if chart path is a directory
     chart_path = pathlib.Path(chart)
     if not chart_path.is_dir():
         return
 
+    # Don't bother with any of this if we've already done it for this chart during this run
+    with _up_to_date_helm_charts_lock:
+        if chart_path.resolve() in _up_to_date_helm_charts:
+            return
+
     # Check if Chart.yaml exists and has dependencies
     chart_yaml = chart_path / "Chart.yaml"
     if not chart_yaml.exists():
@@ -135,21 +323,34 @@ def _update_helm_dependencies(args, chart: str):
     # Read Chart.yaml to check for dependencies
     try:
         with open(chart_yaml, 'r') as f:
-            chart_data = yaml.safe_load(f)
+            chart_data = yaml.load(f, Loader=_YAML_LOADER)
 
         if not chart_data or 'dependencies' not in chart_data:
             return
 
-        # Chart has dependencies, update them
-        common.info(f"Updating Helm chart dependencies for {chart_path.name}...")
-        cmd = ["helm", "dependency", "update", str(chart_path)]
-
-        success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
-        if not success:
-            common.warning(f"Failed to update chart dependencies: {stderr}")
+        # Check whether we've already updated the dependencies against exactly these inputs
+        marker = chart_path / _HELM_DEPS_MARKER_FILE
+        key = _helm_dependencies_hash(chart_path, chart_data)
+        if (chart_path / "charts").is_dir() and marker.is_file() and marker.read_text().strip() == key:
+            common.debug(f"Helm chart dependencies for {chart_path.name} are already up to date.")
         else:
+            # Chart has dependencies, update them
+            common.info(f"Updating Helm chart dependencies for {chart_path.name}...")
+            cmd = ["helm", "dependency", "update", str(chart_path)]
+
+            success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
+            if not success:
+                common.warning(f"Failed to update chart dependencies: {stderr}")
+                return
+
             common.info(f"Successfully updated dependencies for {chart_path.name}")
 
+            # The update may well have rewritten Chart.lock, so hash it again
+            marker.write_text(_helm_dependencies_hash(chart_path, chart_data))
+
+        with _up_to_date_helm_charts_lock:
+            _up_to_date_helm_charts.add(chart_path.resolve())
+
     except Exception as e:
         common.warning(f"Could not check/update chart dependencies: {e}")
 
@@ -159,13 +360,46 @@ def add_helm_repo(name: str, url: str):
     """
     subprocess.run(["helm", "repo", "add", name, url]).check_returncode()
 
+def apply_from_yaml(args, yaml_contents: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE):
+    """
+    Like `create_from_yaml()`, but if the resource already exists, we replace it with the given definition
+    instead of failing. This saves having to delete it first (and so an extra round trip to the API server
+    on every install, even the ones where there is nothing to delete).
+
+    Only single ConfigMaps and Secrets are supported.
+    """
+    _configure(args)
+    client = _api_client(args.kube_config)
+    v1 = k8s.client.CoreV1Api(client)
+    namespace = str(namespace).lower()
+    yaml_object = yaml.load(yaml_contents, Loader=_YAML_LOADER)
+    replace = {
+        'ConfigMap': v1.replace_namespaced_config_map,
+        'Secret': v1.replace_namespaced_secret,
+    }.get(yaml_object['kind'])
+    if replace is None:
+        raise ValueError(f"Cannot apply a {yaml_object['kind']}. Only ConfigMaps and Secrets are supported.")
+
+    try:
+        return k8s.utils.create_from_yaml(client, yaml_objects=[yaml_object], namespace=namespace)
+    except k8s.utils.FailToCreateError as e:
+        if not all(getattr(ex, 'status', None) == 409 for ex in e.api_exceptions):
+            raise e
+
+    common.debug(f"{yaml_object['kind']} {namespace}:{yaml_object['metadata']['name']} already exists. Replacing it...")
+    if yaml_object['kind'] == 'ConfigMap' and yaml_object['metadata']['name'] == kubespec.HWConfigMap.get_name():
+        # We're changing a hardware configuration, so forget any we've read
+        with _hw_config_cache_lock:
+            _hw_config_cache.clear()
+    return replace(yaml_object['metadata']['name'], namespace, yaml_object)
+
 def assign_node_labels(args, node_name: str, labels: dict[str, str]):
     """
     Assigns the given labels to the the given node.
     Labels should be a dict of labels to values.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     body = {
         "metadata": {
@@ -175,6 +409,30 @@ def assign_node_labels(args, node_name: str, labels: dict[str, str]):
     node = _get_node_from_name(v1, node_name)
     v1.patch_node(node.metadata.name, body)
 
+def assign_node_labels_and_taints(args, node_name: str, labels: dict[str, str], node_taints: dict[str, tuple[str, kubespec.TaintEffects]]):
+    """
+    Does what `assign_node_labels()` and `assign_node_taints()` do, but both at once, in a single patch
+    (and without having to look the node up first).
+    """
+    _configure(args)
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
+
+    body = {
+        "metadata": {
+            "labels": labels
+        },
+        "spec": {
+            "taints": [
+                {
+                    "effect": effect,
+                    "key": key,
+                    "value": val,
+                } for key, (val, effect) in node_taints.items()
+            ]
+        }
+    }
+    v1.patch_node(node_name, body)
+
 def assign_node_taints(args, node_name: str, node_taints: dict[str, tuple[str, kubespec.TaintEffects]]):
     """
     Assign the given node taints to the given node. `node_taints` should be a
@@ -184,7 +442,7 @@ def assign_node_taints(args, node_name: str, node_taints: dict[str, tuple[str, k
     }
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     body = {
         "spec": {
@@ -200,75 +458,63 @@ def assign_node_taints(args, node_name: str, node_taints: dict[str, tuple[str, k
     node = _get_node_from_name(v1, node_name)
     v1.patch_node(node.metadata.name, body)
 
-def check_if_helm_chart_is_deployed(args, chart_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> bool:
+def check_if_helm_chart_is_deployed(args, chart_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE, fresh=False) -> bool:
     """
     Checks if the given chart name is present in the cluster.
 
     Convenience function for check_helm_chart_status() == HelmChartStatuses.deployed
     """
-    return check_helm_chart_status(args, chart_name, str(namespace).lower()) == HelmChartStatuses.DEPLOYED
+    return check_helm_chart_status(args, chart_name, str(namespace).lower(), fresh=fresh) == HelmChartStatuses.DEPLOYED
 
-def check_helm_chart_status(args, chart_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> HelmChartStatuses|None:
+def check_helm_chart_status(args, chart_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE, fresh=False) -> HelmChartStatuses|None:
     """
     Returns the status for the given chart, or None if it isn't found in the namespace.
+
+    We may answer from what Helm told us a little while ago. Pass `fresh` if you are waiting for the status to change
+    and so need to know what it is right now.
     """
-    cmd = ["helm", "list", "--kubeconfig", args.kube_config, "--namespace", str(namespace).lower(), "--filter", chart_name, "--output", "json"]
-    success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
-    if not success:
-        raise OSError(f"Helm failed: {stderr}; {stdout}")
+    return _helm_list(args, str(namespace).lower(), fresh=fresh).get(chart_name)
 
-    json_object = json.loads(stdout)
-    if len(json_object) == 0:
-        return None
-    elif len(json_object) > 1:
-        # Regex matched more than one chart name for some reason. This probably shouldn't
-        # have happened. Just look for the first exact match and return that one.
-        for o in json_object:
-            if o['name'] == chart_name:
-                return HelmChartStatuses(o['status'])
-        raise AssertionError("This shouldn't be possible: regex matched more than one chart name, but then couldn't find the chart with the right name.")
-    else:
-        return HelmChartStatuses(json_object[0]['status'])
+def check_helm_chart_statuses(args, chart_names: List[str], namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> Dict[str, HelmChartStatuses|None]:
+    """
+    Like `check_helm_chart_status()`, but for several charts at once (for the price of asking Helm once).
+    Returns a dict of chart name to its status (or None if it isn't found in the namespace).
+    """
+    statuses = _helm_list(args, str(namespace).lower())
+    return {chart_name: statuses.get(chart_name) for chart_name in chart_names}
 
 def check_job_status(args, job_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> JobStatuses:
     """
     Check and return the status of the given job.
+
+    If you want to wait for the job to finish, use `wait_for_job()` instead of calling this in a loop.
     """
+    namespace = str(namespace).lower()
     _configure(args)
-    v1 = k8s.client.BatchV1Api()
+    v1 = k8s.client.BatchV1Api(_api_client(args.kube_config))
 
     try:
-        job = v1.read_namespaced_job_status(job_name, str(namespace).lower())
-        status = job.status
-
-        if status.active is not None and status.active > 0:
-            # At least one pod is still pending or running
-            return JobStatuses.INCOMPLETE
-        elif status.failed is not None and status.failed > 0:
-            # At least one pod failed
-            return JobStatuses.FAILED
-        elif status.succeeded is not None and status.succeeded > 0:
-            # No active or failed pods AND at least one pod is successful. Looks good.
-            return JobStatuses.SUCCEEDED
-        else:
-            # Can't understand this state. No active, failed, or succeeded pods.
-            common.error(f"Kubernetes job {str(namespace).lower()}:{job_name} has unknown status - no active, failed, or succeeded pods.")
-            return JobStatuses.UNKNOWN
+        job = v1.read_namespaced_job_status(job_name, namespace)
+        status = _job_status(job)
+        if status == JobStatuses.UNKNOWN:
+            common.error(f"Kubernetes job {namespace}:{job_name} has unknown status - no active, failed, or succeeded pods.")
+        return status
     except urllib3.exceptions.MaxRetryError:
-        common.warning(f"Could not get the status for k8s job {str(namespace).lower()}:{job_name}; transient networking error")
+        common.warning(f"Could not get the status for k8s job {namespace}:{job_name}; transient networking error")
         return JobStatuses.UNKNOWN
 
 def create_namespace_if_not_exists(args, namespace: str):
     """
     Create the given namespace if it does not already exist.
     """
+    namespace = str(namespace).lower()
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     # Check if namespace exists
     try:
-        v1.read_namespace(str(namespace).lower())
-        common.debug(f"Namespace {str(namespace).lower()} already exists.")
+        v1.read_namespace(namespace)
+        common.debug(f"Namespace {namespace} already exists.")
         namespace_does_not_exist = False
     except k8s.client.exceptions.ApiException as e:
         if e.status == 404:
@@ -277,10 +523,10 @@ def create_namespace_if_not_exists(args, namespace: str):
             raise
 
     if namespace_does_not_exist:
-        common.info(f"Creating namespace {str(namespace).lower()}...")
-        namespace_object = kubespec.ArtieNamespace(str(namespace).lower(), args.docker_tag or "unspecified")
-        create_from_yaml(args, yaml.dump(namespace_object.to_dict()), namespace=str(namespace).lower())
-        common.info(f"Namespace {str(namespace).lower()} created.")
+        common.info(f"Creating namespace {namespace}...")
+        namespace_object = kubespec.ArtieNamespace(namespace, args.docker_tag or "unspecified")
+        create_from_yaml(args, yaml.dump(namespace_object.to_dict(), Dumper=_YAML_DUMPER), namespace=namespace)
+        common.info(f"Namespace {namespace} created.")
 
 def create_from_yaml(args, yaml_contents: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE):
     """
@@ -291,12 +537,11 @@ def create_from_yaml(args, yaml_contents: str, namespace=kubespec.ArtieK8sValues
     that was created in the case that the list would only contain one object.
     """
     _configure(args)
-    client = k8s.client.ApiClient()
+    client = _api_client(args.kube_config)
 
     # Convert from raw YAML into Python
-    print("YAML CONTENTS:", yaml_contents)
-    yaml_object = yaml.safe_load(io.StringIO(yaml_contents))
-    print("YAML Object:", yaml_object)
+    yaml_object = yaml.load(yaml_contents, Loader=_YAML_LOADER)
+    common.debug(f"Creating {yaml_object.get('kind')} {yaml_object.get('metadata', {}).get('name')} from YAML...")
     result = k8s.utils.create_from_yaml(client, yaml_objects=[yaml_object], namespace=str(namespace).lower())
 
     # For whatever reason, the create_from_yaml function creates randomly nested lists.
@@ -309,27 +554,21 @@ def delete_configmap(args, name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_
     """
     Delete a configmap.
     """
-    _configure(args)
-    v1 = k8s.client.CoreV1Api()
-    try:
-        v1.delete_namespaced_config_map(name, str(namespace).lower(), grace_period_seconds=0, propagation_policy='Foreground')
-    except Exception as e:
-        if not ignore_errors:
-            raise e
-        else:
-            common.warning(f"Error deleting config map {str(namespace).lower()}:{name}: {e}")
+    _delete_namespaced(args, "config map", name, namespace, ignore_errors)
 
 def delete_helm_release(args, chart_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE):
     """
     Delete the given Helm chart.
     """
-    status = check_helm_chart_status(args, chart_name, str(namespace).lower())
+    namespace = str(namespace).lower()
+    status = check_helm_chart_status(args, chart_name, namespace)
     if not status:
         common.info(f"Helm release {chart_name} not present. Cannot delete it.")
         return
 
-    cmd = ["helm", "delete", "--kubeconfig", args.kube_config, "--namespace", str(namespace).lower(), "--wait", chart_name, "--timeout", str(args.kube_timeout_s) + 's']
+    cmd = ["helm", "delete", "--kubeconfig", args.kube_config, "--namespace", namespace, "--wait", chart_name, "--timeout", str(args.kube_timeout_s) + 's']
     success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
+    _invalidate_helm_list(args, namespace)
     if not success:
         raise OSError(f"Helm failed: {stderr}; {stdout}")
 
@@ -337,36 +576,29 @@ def delete_job(args, job_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NA
     """
     Delete a K8s job.
     """
-    _configure(args)
-    v1 = k8s.client.BatchV1Api()
-    try:
-        v1.delete_namespaced_job(job_name, str(namespace).lower(), grace_period_seconds=0, propagation_policy='Foreground')
-    except Exception as e:
-        if not ignore_errors:
-            raise e
-        else:
-            common.warning(f"Error deleting job {str(namespace).lower()}:{job_name}: {e}")
+    _delete_namespaced(args, "job", job_name, namespace, ignore_errors)
 
 def delete_namespace(args, namespace: str, ignore_errors=False):
     """
     Delete the given namespace.
     """
+    namespace = str(namespace).lower()
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
     try:
-        v1.delete_namespace(str(namespace).lower(), grace_period_seconds=0, propagation_policy='Foreground')
+        v1.delete_namespace(namespace, grace_period_seconds=0, propagation_policy='Foreground')
     except Exception as e:
         if not ignore_errors:
             raise e
         else:
-            common.warning(f"Error deleting namespace {str(namespace).lower()}: {e}")
+            common.warning(f"Error deleting namespace {namespace}: {e}")
 
 def delete_node(args, node_name: str, ignore_errors=False):
     """
     Remove the given node from the cluster as gracefully as we can.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
     try:
         v1.delete_node(node_name, propagation_policy='Foreground')  # delete dependant children, then parents
     except Exception as e:
@@ -379,36 +611,20 @@ def delete_pod(args, pod_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NA
     """
     Delete a K8s Pod.
     """
-    _configure(args)
-    v1 = k8s.client.CoreV1Api()
-    try:
-        v1.delete_namespaced_pod(pod_name, str(namespace).lower(), grace_period_seconds=0, propagation_policy='Foreground')
-    except Exception as e:
-        if not ignore_errors:
-            raise e
-        else:
-            common.warning(f"Error deleting pod {str(namespace).lower()}:{pod_name}: {e}")
+    _delete_namespaced(args, "pod", pod_name, namespace, ignore_errors)
 
 def delete_secret(args, name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE, ignore_errors=False):
     """
     Delete a secret.
     """
-    _configure(args)
-    v1 = k8s.client.CoreV1Api()
-    try:
-        v1.delete_namespaced_secret(name, str(namespace).lower(), grace_period_seconds=0, propagation_policy='Foreground')
-    except Exception as e:
-        if not ignore_errors:
-            raise e
-        else:
-            common.warning(f"Error deleting secret {str(namespace).lower()}:{name}: {e}")
+    _delete_namespaced(args, "secret", name, namespace, ignore_errors)
 
 def get_all_pods(args, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> list[k8s.client.V1Pod]:
     """
     Get all pods for the given namespace.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
     podlist = v1.list_namespaced_pod(str(namespace).lower())
     return podlist.items
 
@@ -420,29 +636,32 @@ def get_artie_names(args) -> List[str]:
     because that would cause infinite recursion.
     """
     _configure(args, need_artie_name=False)
-    v1 = k8s.client.CoreV1Api()
-    node_list = v1.list_node().items
-    name_list = []
-    for node in node_list:
-        if node.metadata.labels is not None and kubespec.ArtieK8sKeys.ARTIE_ID in node.metadata.labels:
-            artie_name = node.metadata.labels[kubespec.ArtieK8sKeys.ARTIE_ID]
-            name_list.append(artie_name)
-
-    return list(set(name_list))
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
+    # Only ask for the nodes that belong to an Artie, rather than all of them
+    node_list = v1.list_node(label_selector=str(kubespec.ArtieK8sKeys.ARTIE_ID)).items
+    return list({node.metadata.labels[kubespec.ArtieK8sKeys.ARTIE_ID] for node in node_list})
 
 def get_artie_hw_config(args, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> hw_config.HWConfig:
     """
     Access the Artie cluster to retrieve the hardware configuration for an Artie.
+    It rarely changes, so we reuse what we read for up to `_HW_CONFIG_CACHE_TTL_S` seconds.
 
     After this call, we guarantee `args` has `artie_name` in it.
     """
+    namespace = str(namespace).lower()
     _configure(args, need_artie_name=True)
-    v1 = k8s.client.CoreV1Api()
+    key = (args.kube_config, args.artie_name, namespace)
+    with _hw_config_cache_lock:
+        cached = _hw_config_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _HW_CONFIG_CACHE_TTL_S:
+        return cached[1]
+
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     # Retrieve the ConfigMap
     configmap_name = kubespec.HWConfigMap.get_name()
     try:
-        configmap = v1.read_namespaced_config_map(configmap_name, str(namespace).lower())
+        configmap = v1.read_namespaced_config_map(configmap_name, namespace)
     except k8s.client.exceptions.ApiException as e:
         if e.status == 404:
             raise ValueError(f"Hardware configuration ConfigMap '{configmap_name}' not found for Artie '{args.artie_name}'")
@@ -451,6 +670,8 @@ def get_artie_hw_config(args, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPAC
 
     buf = io.BytesIO(configmap.data.encode())
     conf = hw_config.HWConfig.from_config(buf)
+    with _hw_config_cache_lock:
+        _hw_config_cache[key] = (time.monotonic(), conf)
     return conf
 
 def get_node_names(args) -> list[str]:
@@ -458,7 +679,7 @@ def get_node_names(args) -> list[str]:
     Returns a list of node names - one for each one found in the cluster.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     node_list = v1.list_node()
     names = [node.metadata.name for node in node_list.items]
@@ -470,19 +691,30 @@ def get_node_labels(args, node_name: str) -> dict[str, str]:
     Raises a ValueError if the node is not found in the cluster.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     node = _get_node_from_name(v1, node_name)
     return node.metadata.labels
 
+def get_pod(args, pod_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> k8s.client.V1Pod|None:
+    """
+    Get the given pod, or None if there is no such pod in the namespace.
+    """
+    _configure(args)
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
+    try:
+        return v1.read_namespaced_pod(pod_name, str(namespace).lower())
+    except k8s.client.exceptions.ApiException as e:
+        if e.status == 404:
+            return None
+        raise e
+
 def get_pods_from_job(args, job_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE) -> list[k8s.client.V1Pod]:
     """
     Get all the pods for a given job and return them as a List of K8s Job objects.
     """
     _configure(args)
-    v1 = k8s.client.BatchV1Api()
-
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
     podlist = v1.list_namespaced_pod(str(namespace).lower(), label_selector=f"job-name={job_name}")
     return podlist.items
 
@@ -490,6 +722,7 @@ def install_helm_chart(args, name: str, chart: str, sets=None, namespace=kubespe
     """
     Install the given Helm chart, overriding any keys given in the `sets` dict with the corresponding values.
     """
+    namespace = str(namespace).lower()
     if sets is None:
         sets = {}
 
@@ -497,7 +730,7 @@ def install_helm_chart(args, name: str, chart: str, sets=None, namespace=kubespe
     _update_helm_dependencies(args, chart)
 
     # Base command
-    cmd = ["helm", "install", "--kubeconfig", args.kube_config, "--namespace", str(namespace).lower(), "--create-namespace", "--wait", "--timeout", str(args.kube_timeout_s) + 's']
+    cmd = ["helm", "install", "--kubeconfig", args.kube_config, "--namespace", namespace, "--create-namespace", "--wait", "--timeout", str(args.kube_timeout_s) + 's']
 
     # Add value overrides
     for k, v in sets.items():
@@ -508,58 +741,150 @@ def install_helm_chart(args, name: str, chart: str, sets=None, namespace=kubespe
 
     # Run the command
     success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
+    _invalidate_helm_list(args, namespace)
     if not success:
         common.error(f"Helm chart installation failed.")
         try:
-            if not check_if_helm_chart_is_deployed(args, name, str(namespace).lower()):
+            if not check_if_helm_chart_is_deployed(args, name, namespace):
                 common.error(f"Attempting to clean up after ourselves...")
-                delete_helm_release(args, name, str(namespace).lower())
+                delete_helm_release(args, name, namespace)
         except Exception as e:
-            cleancmd = f"helm delete --kubeconfig {args.kube_config} --namespace {str(namespace).lower()} --wait {name}"
+            cleancmd = f"helm delete --kubeconfig {args.kube_config} --namespace {namespace} --wait {name}"
             common.warning(f"Could not clean up the failed Helm deployment. You may need to do so manually with {cleancmd}. Error deploying in the first place: {stderr}; {stdout}")
             raise e
         raise OSError(f"Helm failed: {stderr}; {stdout}")
 
+def install_helm_charts(args, specs: List[Tuple[str, str, dict|None, str]], concurrency: int|None = None):
+    """
+    Install several independent Helm charts at once. `specs` is a list of (name, chart, sets, namespace) tuples,
+    as you would pass to `install_helm_chart()`. At most `concurrency` charts are installed at any one time
+    (`args.helm_concurrency` if not given, or `_DEFAULT_HELM_CONCURRENCY` if that isn't given either).
+
+    Raises the first error we come across, but only once all the installs have finished one way or another.
+    """
+    if not specs:
+        return
+
+    if concurrency is None:
+        concurrency = getattr(args, 'helm_concurrency', None) or _DEFAULT_HELM_CONCURRENCY
+
+    # Get every chart's dependencies sorted up front (once per chart), so that the installs
+    # don't all go writing to the same charts/ directories at the same time
+    for chart in dict.fromkeys(chart for _, chart, _, _ in specs):
+        _update_helm_dependencies(args, chart)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(specs))) as executor:
+        futures = [executor.submit(install_helm_chart, args, name, chart, sets, namespace) for name, chart, sets, namespace in specs]
+        errors = [f.exception() for f in concurrent.futures.as_completed(futures) if f.exception() is not None]
+    if errors:
+        raise errors[0]
+
 def log_job_results(args, job_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE):
     """
     Log all lines from all pods in the given job.
     """
+    namespace = str(namespace).lower()
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
+
+    pods = get_pods_from_job(args, job_name, namespace)
+    if not pods:
+        return
 
-    pods = get_pods_from_job(args, job_name, str(namespace).lower())
-    for pod in pods:
-        logs = v1.read_namespaced_pod_log(pod.metadata.name, str(namespace).lower())
-        common.info(f"Reading logs from pod {str(namespace).lower()}:{pod.metadata.name}:")
-        for line in logs.splitlines():
-            common.info(line.rstrip())
+    # Fetch all the pods' logs at once, but log them one pod at a time (and in order) so they don't get jumbled together
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_LOG_FETCHES, len(pods))) as executor:
+        all_logs = executor.map(lambda pod: v1.read_namespaced_pod_log(pod.metadata.name, namespace), pods)
+        for pod, logs in zip(pods, all_logs):
+            common.info(f"Reading logs from pod {namespace}:{pod.metadata.name}:")
+            for line in logs.splitlines():
+                common.info(line.rstrip())
 
 def node_is_online(args, node_name: str) -> bool:
     """
     Returns True if the we can see the given node is online. False otherwise.
     """
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
-
-    node_list = v1.list_node().items
-    for node in node_list:
-        if node.metadata.name == node_name:
-            conditions = node.status.conditions
-            for c in conditions:
-                if c.type == "Ready" and c.status != "True":
-                    return False
-                elif c.type == "Ready" and c.status == "True":
-                    return True
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
-    # Couldn't find the node
-    return False
+    try:
+        return _node_is_ready(_get_node_from_name(v1, node_name))
+    except ValueError:
+        # Couldn't find the node
+        return False
+
+def wait_for_job(args, job_name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE, timeout_s: float|None = None) -> JobStatuses:
+    """
+    Wait for the given job to finish, returning JobStatuses.SUCCEEDED or JobStatuses.FAILED as soon as it does.
+    If it is still going after `timeout_s` (forever, if None), we return whatever status it has at that point.
+
+    Rather than polling the API server, we watch the job and so find out the moment that it changes.
+    """
+    namespace = str(namespace).lower()
+    _configure(args)
+    v1 = k8s.client.BatchV1Api(_api_client(args.kube_config))
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    status = JobStatuses.UNKNOWN
+    while deadline is None or (remaining_s := deadline - time.monotonic()) > 0:
+        # The API server may end a watch early (or tell us our place in the history is gone - 410),
+        # in which case we just start another one. Watching without a resource version gets us the
+        # job's current state first, then any changes to it, so we can't miss the job finishing in between.
+        kwargs = {} if deadline is None else {'timeout_seconds': max(int(remaining_s), 1)}
+        w = k8s.watch.Watch()
+        try:
+            for event in w.stream(v1.list_namespaced_job, namespace, field_selector=f"metadata.name={job_name}", **kwargs):
+                status = _job_status(event['object'])
+                if status in (JobStatuses.SUCCEEDED, JobStatuses.FAILED):
+                    w.stop()
+                    return status
+        except k8s.client.exceptions.ApiException as e:
+            if e.status != 410:
+                raise
+            common.debug(f"Watch on k8s job {namespace}:{job_name} expired. Starting a new one.")
+        except urllib3.exceptions.MaxRetryError:
+            common.warning(f"Lost the watch on k8s job {namespace}:{job_name}; transient networking error. Trying again...")
+            time.sleep(5)
+    return status
+
+def wait_for_node_online(args, node_name: str, timeout_s: float) -> bool:
+    """
+    Wait for the given node to come online, returning True as soon as it does or False if it doesn't within `timeout_s`.
+
+    Rather than polling the API server, we watch the node and so find out the moment that it changes.
+    """
+    _configure(args)
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
+    deadline = time.monotonic() + timeout_s
+    try:
+        # The API server may end a watch early, in which case we just start another one
+        while (remaining_s := deadline - time.monotonic()) > 0:
+            # Watching without a resource version gets us the node's current state first, then any changes to it
+            w = k8s.watch.Watch()
+            for event in w.stream(v1.list_node, field_selector=f"metadata.name={node_name}", timeout_seconds=max(int(remaining_s), 1)):
+                if _node_is_ready(event['object']):
+                    w.stop()
+                    return True
+        return False
+    except k8s.client.exceptions.ApiException as e:
+        common.warning(f"Could not watch node {node_name} ({e}). Polling it instead...")
+
+    # Fall back to asking over and over, backing off as we go so as not to hammer the API server
+    delay_s = 1
+    while not node_is_online(args, node_name):
+        remaining_s = deadline - time.monotonic()
+        if remaining_s <= 0:
+            return False
+        time.sleep(min(delay_s, remaining_s))
+        delay_s = min(delay_s * 2, 10)
+    return True
 
 def uninstall_helm_chart(args, name: str, namespace=kubespec.ArtieK8sValues.DEFAULT_NAMESPACE):
     """
     Uninstall the given chart.
     """
-    cmd = ["helm", "uninstall", "--namespace", str(namespace).lower(), "--wait", name, "--timeout", str(args.kube_timeout_s) + 's']
+    namespace = str(namespace).lower()
+    cmd = ["helm", "uninstall", "--namespace", namespace, "--wait", name, "--timeout", str(args.kube_timeout_s) + 's']
     success, retcode, stderr, stdout = _handle_transient_network_errors(cmd)
+    _invalidate_helm_list(args, namespace)
     if not success:
         raise OSError(f"Error uninstalling chart: {stderr}; {stdout}")
 
@@ -570,11 +895,11 @@ def verify_access(args) -> Tuple[bool, Exception|None]:
     """
     common.info("Verifying access to Kubernetes cluster...")
     _configure(args)
-    v1 = k8s.client.CoreV1Api()
+    v1 = k8s.client.CoreV1Api(_api_client(args.kube_config))
 
     try:
         common.info("Listing nodes in cluster to verify access...")
-        v1.list_node()
+        v1.list_node(limit=1)  # We don't care about the nodes themselves, just that we're allowed to ask for them
         common.info("Access to Kubernetes cluster verified.")
         return True, None
     except Exception as e:
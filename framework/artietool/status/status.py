@@ -380,7 +380,19 @@ def _get_nodes_status(args, artie_hw_config: hw_config.HWConfig, formatter: Stat
 
 def _get_pods_status(args, formatter: StatusFormatter):
     """Get status for pod(s)"""
-    # Get all the pods regardless
+    # If we only want the one pod, just ask for that one
+    if not args.list and args.pod != "all":
+        try:
+            pod = kube.get_pod(args, args.pod)
+        except Exception as e:
+            formatter.set_error(f"Error getting pod status: {e}")
+            return
+
+        if pod is not None:
+            _print_pod_status(args, pod, formatter)
+            return
+
+    # Otherwise get all the pods
     try:
         pods = kube.get_all_pods(args)
     except Exception as e:
@@ -397,18 +409,10 @@ def _get_pods_status(args, formatter: StatusFormatter):
             _print_pod_status(args, pod, formatter)
         return
 
-    # Get status for a specific pod
-    pod_found = False
-    for pod in pods:
-        if pod.metadata.name == args.pod:
-            pod_found = True
-            _print_pod_status(args, pod, formatter)
-            break
-
-    if not pod_found:
-        pod_names = [pod.metadata.name for pod in pods]
-        error_msg = f"Pod '{args.pod}' not found in Kubernetes. Available pods: {pod_names}"
-        formatter.set_error(error_msg)
+    # We couldn't find the specific pod we were asked for
+    pod_names = [pod.metadata.name for pod in pods]
+    error_msg = f"Pod '{args.pod}' not found in Kubernetes. Available pods: {pod_names}"
+    formatter.set_error(error_msg)
 
 def _get_sensors_status(args, artie_hw_config: dict, formatter: StatusFormatter):
     """Get status for sensor(s)"""